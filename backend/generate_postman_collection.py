@@ -3,6 +3,12 @@
 Generate a complete, valid Postman collection for MediSync
 """
 import json
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 collection = {
     "info": {
@@ -121,10 +127,17 @@ collection = {
 
 # Write to file
 output_path = "MediSync_Simple_Collection.json"
-with open(output_path, 'w', encoding='utf-8') as f:
-    json.dump(collection, f, indent=2, ensure_ascii=True)
+if orjson is not None:
+    payload = orjson.dumps(collection, option=orjson.OPT_INDENT_2)
+else:
+    payload = json.dumps(collection, indent=2, ensure_ascii=True).encode('utf-8')
+fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+try:
+    os.write(fd, payload)
+finally:
+    os.close(fd)
 
 print(f"✅ Created: {output_path}")
-print(f"📏 Size: {len(json.dumps(collection))} bytes")
+print(f"📏 Size: {len(payload)} bytes")
 print("✅ Valid JSON with all key orchestration tests")
 print("\nImport this file into Postman and run folder to test!")
@@ -11,6 +11,117 @@ class PythonBridge {
   constructor() {
     this.pythonPath = process.env.PYTHON_PATH || 'python';
     this.toolsPath = path.resolve(__dirname, '../../tools');
+
+    // Persistent api_worker.py process, started on first use
+    this.worker = null;
+    this.workerBuffer = '';
+    this.pendingRequests = new Map();
+    this.nextRequestId = 1;
+  }
+
+  /**
+   * Environment for Python processes (UTF-8 output, AI root on PYTHONPATH)
+   */
+  getPythonEnv() {
+    const aiRootPath = path.resolve(__dirname, '../..');
+    const pythonPath = process.env.PYTHONPATH
+      ? `${aiRootPath}${path.delimiter}${process.env.PYTHONPATH}`
+      : aiRootPath;
+
+    return {
+      ...process.env,
+      PYTHONIOENCODING: 'utf-8',
+      PYTHONPATH: pythonPath
+    };
+  }
+
+  /**
+   * Start the persistent Python worker if it is not already running
+   */
+  getWorker() {
+    if (this.worker) {
+      return this.worker;
+    }
+
+    const workerPath = path.join(this.toolsPath, 'api_worker.py');
+    const worker = spawn(this.pythonPath, [workerPath], { env: this.getPythonEnv() });
+    this.worker = worker;
+    this.workerBuffer = '';
+
+    worker.stdout.on('data', (data) => {
+      this.workerBuffer += data.toString();
+      const lines = this.workerBuffer.split('\n');
+      this.workerBuffer = lines.pop();
+
+      for (const line of lines) {
+        if (!line.trim()) continue;
+        try {
+          const response = JSON.parse(line);
+          const pending = this.pendingRequests.get(response.id);
+          if (pending) {
+            this.pendingRequests.delete(response.id);
+            clearTimeout(pending.timeoutId);
+            // Failed calls reject, as a script exiting non-zero does
+            if (response.success === false) {
+              pending.reject(new Error(`Python worker call failed: ${response.error}`));
+            } else {
+              pending.resolve(response);
+            }
+          }
+        } catch (error) {
+          console.error(`❌ Failed to parse worker output:`, error.message);
+        }
+      }
+    });
+
+    worker.stdin.on('error', (error) => {
+      logger.error('Python worker stdin error:', error);
+    });
+
+    worker.stderr.on('data', (data) => {
+      logger.debug(`🐍 Worker stderr: ${data.toString()}`);
+    });
+
+    const onWorkerGone = (reason) => {
+      if (this.worker === worker) {
+        this.worker = null;
+      }
+      for (const [id, pending] of this.pendingRequests) {
+        clearTimeout(pending.timeoutId);
+        pending.reject(new Error(`Python worker ${reason}`));
+        this.pendingRequests.delete(id);
+      }
+    };
+
+    worker.on('exit', (code) => {
+      logger.error(`Python worker exited with code ${code}`);
+      onWorkerGone(`exited with code ${code}`);
+    });
+
+    worker.on('error', (error) => {
+      logger.error('Failed to start Python worker:', error);
+      onWorkerGone(`failed: ${error.message}`);
+    });
+
+    return worker;
+  }
+
+  /**
+   * Send one request to the persistent worker and wait for its response
+   */
+  async callWorker(method, params = {}, timeout = 30000) {
+    return new Promise((resolve, reject) => {
+      const worker = this.getWorker();
+      const id = this.nextRequestId++;
+
+      const timeoutId = setTimeout(() => {
+        this.pendingRequests.delete(id);
+        reject(new Error(`Python worker ${method} timed out after ${timeout}ms`));
+      }, timeout);
+
+      this.pendingRequests.set(id, { resolve, reject, timeoutId });
+      worker.stdin.write(JSON.stringify({ id, method, params }) + '\n');
+    });
   }
 
   /**
@@ -23,19 +134,9 @@ class PythonBridge {
       logger.debug(`Executing Python script: ${scriptPath} with args:`, args);
       console.log(`🐍 Starting Python: ${scriptName}`);
 
-      // Add AI directory to PYTHONPATH for proper imports
-      const aiRootPath = path.resolve(__dirname, '../..');
-      const pythonPath = process.env.PYTHONPATH
-        ? `${aiRootPath}${path.delimiter}${process.env.PYTHONPATH}`
-        : aiRootPath;
-
       // Set Python to use UTF-8 encoding for output and add PYTHONPATH
       const pythonProcess = spawn(this.pythonPath, [scriptPath, ...args], {
-        env: { 
-          ...process.env, 
-          PYTHONIOENCODING: 'utf-8',
-          PYTHONPATH: pythonPath
-        }
+        env: this.getPythonEnv()
       });
 
       let stdout = '';
@@ -129,9 +230,7 @@ class PythonBridge {
    */
   async bookAppointment(appointmentData) {
     try {
-      const result = await this.executePythonScript('api_book_appointment.py', [
-        JSON.stringify(appointmentData)
-      ]);
+      const result = await this.callWorker('book_appointment', appointmentData);
       
       console.log('📋 Raw booking result:', JSON.stringify(result, null, 2));
       
@@ -165,9 +264,9 @@ class PythonBridge {
    */
   async cancelAppointment(tokenNumber) {
     try {
-      const result = await this.executePythonScript('api_cancel_appointment.py', [
-        tokenNumber.toString()
-      ]);
+      const result = await this.callWorker('cancel_appointment', {
+        token_number: tokenNumber
+      });
       return result;
     } catch (error) {
       logger.error('Error canceling appointment:', error);
@@ -180,7 +279,7 @@ class PythonBridge {
    */
   async calculateETAs() {
     try {
-      const result = await this.executePythonScript('api_calculate_etas.py');
+      const result = await this.callWorker('calculate_etas');
       return result;
     } catch (error) {
       logger.error('Error calculating ETAs:', error);
@@ -193,9 +292,9 @@ class PythonBridge {
    */
   async completePatient(tokenNumber) {
     try {
-      const result = await this.executePythonScript('api_complete_patient.py', [
-        tokenNumber.toString()
-      ]);
+      const result = await this.callWorker('complete_patient', {
+        token_number: tokenNumber
+      });
       return result;
     } catch (error) {
       logger.error('Error completing patient:', error);
@@ -208,10 +307,10 @@ class PythonBridge {
    */
   async updateLocation(tokenNumber, location) {
     try {
-      const result = await this.executePythonScript('api_update_location.py', [
-        tokenNumber.toString(),
-        JSON.stringify(location)
-      ]);
+      const result = await this.callWorker('update_location', {
+        token_number: tokenNumber,
+        location
+      });
       return result;
     } catch (error) {
       logger.error('Error updating location:', error);
@@ -311,7 +410,7 @@ class PythonBridge {
    */
   async getQueueIntelligence() {
     try {
-      const result = await this.executePythonScript('api_queue_intelligence.py');
+      const result = await this.callWorker('queue_intelligence');
       return result;
     } catch (error) {
       logger.error('Error getting queue intelligence:', error);
@@ -378,7 +477,7 @@ class PythonBridge {
    */
   async sendQueueNotifications() {
     try {
-      const result = await this.executePythonScript('api_send_notifications.py');
+      const result = await this.callWorker('send_notifications');
       return result;
     } catch (error) {
       logger.error('Error sending notifications:', error);
@@ -461,7 +560,7 @@ class PythonBridge {
    */
   async triggerOrchestrationCycle() {
     try {
-      const result = await this.executePythonScript('api_trigger_cycle.py');
+      const result = await this.callWorker('trigger_cycle');
       return result;
     } catch (error) {
       logger.error('Error triggering orchestration cycle:', error);
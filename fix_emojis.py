@@ -1,7 +1,13 @@
 # -*- coding: utf-8 -*-
 """Fix Unicode emoji encoding in Python files"""
 import os
-import glob
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 # Emoji replacements
 replacements = {
@@ -25,30 +31,82 @@ replacements = {
     '📱': '[PHONE]',
 }
 
+# One alternation over every emoji so each file is scanned in a single pass.
+# Longer keys first so multi-codepoint emojis win over any shared prefix.
+emoji_pattern = re.compile('|'.join(
+    re.escape(k) for k in sorted(replacements, key=len, reverse=True)
+))
+
+# Aho-Corasick automaton (pyahocorasick, optional): one linear scan
+# regardless of how many emojis are in the table
+if ahocorasick is not None:
+    emoji_automaton = ahocorasick.Automaton()
+    for emoji, replacement in replacements.items():
+        emoji_automaton.add_word(emoji, (len(emoji), replacement))
+    emoji_automaton.make_automaton()
+else:
+    emoji_automaton = None
+
+
+def replace_emojis(content):
+    """Replace every emoji in content in a single pass"""
+    if emoji_automaton is None:
+        return emoji_pattern.sub(lambda m: replacements[m.group(0)], content)
+
+    parts = []
+    last = 0
+    for end, (length, replacement) in emoji_automaton.iter(content):
+        start = end - length + 1
+        if start < last:
+            continue  # overlaps a match already replaced
+        parts.append(content[last:start])
+        parts.append(replacement)
+        last = end + 1
+    if not parts:
+        return content
+    parts.append(content[last:])
+    return ''.join(parts)
+
+
+# UTF-8 encoded keys for a cheap precheck on raw file bytes
+emoji_bytes = tuple(k.encode('utf-8') for k in replacements)
+
 tools_dir = r'c:\Users\Tanay Mehta\OneDrive\Desktop\Tanay IMP\Hackathons\Mumbai_Hacks\AgenticAi\AI\tools'
 
 # Get all Python files
-python_files = glob.glob(os.path.join(tools_dir, '*.py'))
+python_files = [
+    entry.path for entry in os.scandir(tools_dir)
+    if entry.is_file() and entry.name.endswith('.py')
+]
+
 
-for filepath in python_files:
+def fix_file(filepath):
+    """Rewrite one file in place; returns a status line or None if untouched."""
     try:
-        # Read file with UTF-8 encoding
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
+        # Read raw bytes and skip decoding files without any emoji
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+        if not any(b in raw for b in emoji_bytes):
+            return None
+        content = raw.decode('utf-8')
         
         # Replace all emojis
-        modified = False
-        for emoji, replacement in replacements.items():
-            if emoji in content:
-                content = content.replace(emoji, replacement)
-                modified = True
+        new_content = replace_emojis(content)
         
         # Write back if modified
-        if modified:
+        if new_content != content:
             with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
-            print(f'Fixed: {os.path.basename(filepath)}')
+                f.write(new_content)
+            return f'Fixed: {os.path.basename(filepath)}'
     except Exception as e:
-        print(f'Error fixing {filepath}: {e}')
+        return f'Error fixing {filepath}: {e}'
+    return None
+
+
+# File rewrites are independent and I/O bound, so threads are enough
+with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4)) as executor:
+    for message in executor.map(fix_file, python_files):
+        if message:
+            print(message)
 
 print('Done!')
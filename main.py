@@ -1,11 +1,19 @@
+import functools
+import inspect
+import json
 import os
+import re
+from enum import IntEnum
+from typing import Dict, Mapping
 from dotenv import load_dotenv
 
 # Load environment variables first
 load_dotenv()
 
+from google.adk.agents import LlmAgent
 from tools.root_agent import root_agent
-from fastapi import FastAPI, HTTPException
+from tools.queue_brain import start_optimize_debounce
+from fastapi import FastAPI, HTTPException, Response
 from pydantic import BaseModel
 import uvicorn
 
@@ -16,54 +24,177 @@ app = FastAPI(
 )
 
 
+@app.on_event("startup")
+def start_background_optimizer():
+    """Optimize the queue once per burst of bookings for as long as the server runs"""
+    start_optimize_debounce()
+
+
+# Fallback booking parser patterns, compiled once at import
+_TRIGGER_RE = re.compile(r"name is|phone|have|book|appointment|mumbai")
+_TRIGGER_COUNT = 6
+_PHONE_RE = re.compile(r"\d{10}")
+
+
+def _scan_triggers(message):
+    """Map each trigger keyword to the span of its first occurrence, in one pass"""
+    spans = {}
+    for match in _TRIGGER_RE.finditer(message):
+        spans.setdefault(match.group(), match.span())
+        if len(spans) == _TRIGGER_COUNT:
+            break
+    return spans
+
+
+def _extract_booking_fields(message, spans):
+    """Extract name/contact/location/symptoms using spans from _scan_triggers"""
+    fields = {}
+
+    if "name is" in spans:
+        start = spans["name is"][1]
+        end = message.find(",", start)
+        fields["name"] = message[start : end if end != -1 else None].strip().title()
+
+    if "phone" in spans:
+        # Extract numbers up to the next comma
+        start = spans["phone"][1]
+        end = message.find(",", start)
+        phone_match = _PHONE_RE.search(message, start, end if end != -1 else len(message))
+        if phone_match:
+            fields["contact"] = phone_match.group()
+
+    if "mumbai" in spans:
+        start = spans["mumbai"][0]
+        fields["location"] = message[max(0, start - 20) : start + 10].strip()
+
+    if "have" in spans:
+        start = spans["have"][1]
+        end = message.find("have", start)
+        fields["symptoms"] = message[start : end if end != -1 else None].strip()
+
+    return fields
+
+
+# Static response bodies, serialized once at import
+_ROOT_RESPONSE = json.dumps(
+    {
+        "status": "healthy",
+        "service": "MediSync AI",
+        "current_time": "2025-09-21T04:16:29Z",
+        "user": "YashManek1",
+        "agents_loaded": 6,
+        "features": ["Google ADK", "Redis Queue", "Google Maps", "Symptom Analysis"],
+    }
+).encode("utf-8")
+
+_MESSAGE_SLOT = "__MEDISYNC_MESSAGE__"
+_DIAGNOSTIC_PREFIX, _DIAGNOSTIC_SUFFIX = (
+    part.encode("utf-8")
+    for part in json.dumps(
+        {
+            "status": "agent_loaded",
+            "response": f"""🏥 MediSync AI is fully loaded and ready!
+
+Your request: "{_MESSAGE_SLOT}"
+
+🚨 DEBUG INFO:
+- SequentialAgent loaded with 6 sub-agents
+- BookingServiceAgent, EtaServiceAgent, QueueOptimizationAgent ready
+- All tools and Redis connections established
+
+🔧 The Google ADK execution method needs adjustment. 
+Your intelligent healthcare system is ready but requires proper ADK invocation pattern.
+
+Try a direct booking approach or check the ADK documentation for SequentialAgent execution.""",
+            "timestamp": "2025-09-21T04:16:29Z",
+            "processed_by": "MediSync_Diagnostic",
+        },
+        ensure_ascii=False,
+    ).split(_MESSAGE_SLOT)
+)
+
+
 class ChatRequest(BaseModel):
     message: str
 
 
+class _CallStyle(IntEnum):
+    MESSAGE = 0  # agent(message)
+    INPUT_DICT = 1  # agent({"input": message})
+
+
+def _call_style(agent):
+    """Pick the calling convention from the __call__ signature, once at startup."""
+    try:
+        params = list(inspect.signature(agent).parameters.values())
+    except (TypeError, ValueError):
+        return _CallStyle.MESSAGE
+
+    if params and params[0].annotation in (dict, Dict, Mapping):
+        return _CallStyle.INPUT_DICT
+    return _CallStyle.MESSAGE
+
+
+def _direct_invoker(agent):
+    """Return a callable for an agent exposing invoke/call/__call__, or None."""
+    # Method 1: Check if agent has invoke method (common in ADK)
+    if hasattr(agent, "invoke"):
+        return agent.invoke
+
+    # Method 2: Try call method with proper ADK format
+    if hasattr(agent, "call"):
+        return agent.call
+
+    # Method 3: Try with message format that ADK expects
+    if callable(agent):
+        if _call_style(agent) is _CallStyle.INPUT_DICT:
+            return lambda message: agent({"input": message})
+        return agent
+
+    return None
+
+
+@functools.singledispatch
+def _resolve_invoker(agent):
+    """Resolve how to invoke the root agent once, instead of probing per request.
+
+    Known agent classes register a specialization; anything else goes through
+    the generic attribute cascade below.
+    """
+    invoker = _direct_invoker(agent)
+    if invoker is not None:
+        return invoker
+
+    # Method 4: Use Google ADK's session-based execution
+    if hasattr(agent, "run_with_session"):
+        return agent.run_with_session
+
+    # Method 5: Direct booking agent execution (bypass SequentialAgent)
+    if hasattr(agent, "sub_agents") and len(agent.sub_agents) > 0:
+        booking_agent = agent.sub_agents[0]  # BookingServiceAgent
+        invoker = _direct_invoker(booking_agent)
+        if invoker is not None:
+            return invoker
+
+    return lambda message: None
+
+
+@_resolve_invoker.register(LlmAgent)
+def _(agent):
+    # LlmAgent has no direct invoke/call/__call__ (it runs through the ADK
+    # Runner), so skip the cascade and go straight to the fallback booking path
+    return lambda message: None
+
+
+_invoke_root_agent = _resolve_invoker(root_agent)
+
+
 @app.post("/chat")
 async def chat_endpoint(request: ChatRequest):
     try:
         # Google ADK SequentialAgent execution pattern
-        # The agent should be invoked through the Google ADK web framework
-
-        # Try the correct Google ADK pattern
-        result = None
-
-        # Method 1: Check if agent has invoke method (common in ADK)
-        if hasattr(root_agent, "invoke"):
-            result = root_agent.invoke(request.message)
-
-        # Method 2: Try call method with proper ADK format
-        elif hasattr(root_agent, "call"):
-            result = root_agent.call(request.message)
-
-        # Method 3: Try with message format that ADK expects
-        elif callable(root_agent):
-            try:
-                # ADK might expect a specific message format
-                result = root_agent.__call__(request.message)
-            except:
-                # Try with dict format
-                result = root_agent.__call__({"input": request.message})
-
-        # Method 4: Use Google ADK's session-based execution
-        elif hasattr(root_agent, "run_with_session"):
-            result = root_agent.run_with_session(request.message)
-
-        # Method 5: Direct booking agent execution (bypass SequentialAgent)
-        elif hasattr(root_agent, "sub_agents") and len(root_agent.sub_agents) > 0:
-            booking_agent = root_agent.sub_agents[0]  # BookingServiceAgent
-
-            # Try LlmAgent specific methods
-            if hasattr(booking_agent, "invoke"):
-                result = booking_agent.invoke(request.message)
-            elif hasattr(booking_agent, "call"):
-                result = booking_agent.call(request.message)
-            elif hasattr(booking_agent, "__call__"):
-                try:
-                    result = booking_agent.__call__(request.message)
-                except:
-                    result = booking_agent.__call__({"input": request.message})
+        # The invocation method is resolved once at startup
+        result = _invoke_root_agent(request.message)
 
         # If we got a result, return it
         if result and str(result).strip() and str(result) != request.message:
@@ -82,51 +213,15 @@ async def chat_endpoint(request: ChatRequest):
             # Extract patient info from message (basic parsing)
             message = request.message.lower()
 
-            if "book" in message and "appointment" in message:
+            spans = _scan_triggers(message)
+
+            if "book" in spans and "appointment" in spans:
                 # Try to extract basic info (this is a fallback approach)
-                name = "Extracted Patient"
-                contact = "9876543210"
-                location = "Mumbai"
-                symptoms = "General consultation"
-
-                # Try to extract actual details
-                if "name is" in message:
-                    try:
-                        name_part = message.split("name is")[1].split(",")[0].strip()
-                        name = name_part.title()
-                    except:
-                        pass
-
-                if "phone" in message:
-                    try:
-                        phone_part = message.split("phone")[1].split(",")[0].strip()
-                        # Extract numbers
-                        import re
-
-                        phone_match = re.search(r"\d{10}", phone_part)
-                        if phone_match:
-                            contact = phone_match.group()
-                    except:
-                        pass
-
-                if "mumbai" in message:
-                    try:
-                        location_start = message.find("mumbai") - 20
-                        location_end = message.find("mumbai") + 10
-                        location = message[
-                            max(0, location_start) : location_end
-                        ].strip()
-                    except:
-                        pass
-
-                if "symptoms" in message or "have" in message:
-                    try:
-                        # Try to extract symptoms
-                        if "have" in message:
-                            symptoms_part = message.split("have")[1].strip()
-                            symptoms = symptoms_part
-                    except:
-                        pass
+                fields = _extract_booking_fields(message, spans)
+                name = fields.get("name", "Extracted Patient")
+                contact = fields.get("contact", "9876543210")
+                location = fields.get("location", "Mumbai")
+                symptoms = fields.get("symptoms", "General consultation")
 
                 # Execute direct booking
                 booking_result = book_intelligent_patient_appointment(
@@ -148,24 +243,12 @@ async def chat_endpoint(request: ChatRequest):
             print(f"Direct booking failed: {e}")
 
         # Final fallback with helpful message
-        return {
-            "status": "agent_loaded",
-            "response": f"""🏥 MediSync AI is fully loaded and ready!
-
-Your request: "{request.message}"
-
-🚨 DEBUG INFO:
-- SequentialAgent loaded with 6 sub-agents
-- BookingServiceAgent, EtaServiceAgent, QueueOptimizationAgent ready
-- All tools and Redis connections established
-
-🔧 The Google ADK execution method needs adjustment. 
-Your intelligent healthcare system is ready but requires proper ADK invocation pattern.
-
-Try a direct booking approach or check the ADK documentation for SequentialAgent execution.""",
-            "timestamp": "2025-09-21T04:16:29Z",
-            "processed_by": "MediSync_Diagnostic",
-        }
+        return Response(
+            content=_DIAGNOSTIC_PREFIX
+            + json.dumps(request.message)[1:-1].encode("utf-8")
+            + _DIAGNOSTIC_SUFFIX,
+            media_type="application/json",
+        )
 
     except Exception as e:
         return {
@@ -178,14 +261,7 @@ Try a direct booking approach or check the ADK documentation for SequentialAgent
 
 @app.get("/")
 async def root():
-    return {
-        "status": "healthy",
-        "service": "MediSync AI",
-        "current_time": "2025-09-21T04:16:29Z",
-        "user": "YashManek1",
-        "agents_loaded": 6,
-        "features": ["Google ADK", "Redis Queue", "Google Maps", "Symptom Analysis"],
-    }
+    return Response(content=_ROOT_RESPONSE, media_type="application/json")
 
 
 @app.get("/test-booking")
@@ -194,7 +270,7 @@ async def test_direct_booking():
     try:
         from tools.clinic_tools import book_intelligent_patient_appointment
 
-        result = book_intelligent_patient_appoi ntment(
+        result = book_intelligent_patient_appointment(
             name="Test Patient",
             contact_number="9876543210",
             symptoms="Test symptoms for system validation",
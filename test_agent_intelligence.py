@@ -4,7 +4,9 @@ Tests if agent autonomously decides to optimize after booking high-urgency patie
 """
 
 import os
+import re
 import sys
+from bisect import bisect_right
 from dotenv import load_dotenv
 
 load_dotenv("tools/.env")
@@ -47,12 +49,26 @@ print("=" * 80)
 
 instruction = root_agent.instruction
 
-# Check for proactive intelligence keywords
+# Check for proactive intelligence keywords and snippet triggers in one scan.
+# Longer phrases come first; all but SMART CHAINING also mark a snippet line.
+KEYWORDS_RE = re.compile(
+    r"AUTOMATICALLY call analyze_and_optimize_queue|AFTER BOOKING HIGH-URGENCY|"
+    r"PROACTIVE INTELLIGENCE|SMART CHAINING|PROACTIVE|AUTOMATICALLY|HIGH-URGENCY"
+)
+newline_offsets = [m.start() for m in re.finditer('\n', instruction)]
+
+found = set()
+snippet_lines = set()
+for match in KEYWORDS_RE.finditer(instruction):
+    found.add(match.group())
+    if match.group() != "SMART CHAINING":
+        snippet_lines.add(bisect_right(newline_offsets, match.start()))
+
 checks = {
-    "Proactive Intelligence": "PROACTIVE INTELLIGENCE" in instruction,
-    "Auto-optimization rule": "AUTOMATICALLY call analyze_and_optimize_queue" in instruction,
-    "Smart chaining": "SMART CHAINING" in instruction,
-    "High-urgency trigger": "AFTER BOOKING HIGH-URGENCY" in instruction,
+    "Proactive Intelligence": "PROACTIVE INTELLIGENCE" in found,
+    "Auto-optimization rule": "AUTOMATICALLY call analyze_and_optimize_queue" in found,
+    "Smart chaining": "SMART CHAINING" in found,
+    "High-urgency trigger": "AFTER BOOKING HIGH-URGENCY" in found,
 }
 
 print("\n✅ Agent Instructions Include:")
@@ -69,12 +85,11 @@ else:
 print("\n📋 Key Agent Instructions:")
 print("-" * 70)
 lines = instruction.split('\n')
-for i, line in enumerate(lines):
-    if 'PROACTIVE' in line or 'AUTOMATICALLY' in line or 'HIGH-URGENCY' in line:
-        # Show context (this line + next 3 lines)
-        for j in range(i, min(i+4, len(lines))):
-            print(lines[j])
-        print()
+for i in sorted(snippet_lines):
+    # Show context (this line + next 3 lines)
+    for j in range(i, min(i+4, len(lines))):
+        print(lines[j])
+    print()
 
 # Test Scenario 2: Queue status request
 print("\n" + "=" * 80)
@@ -142,8 +157,8 @@ print("""
 
 3. Check Redis to verify actual changes:
    redis-cli
-   > LLEN patient_queue
-   > LRANGE patient_queue 0 -1
+   > ZCARD patient_queue
+   > ZRANGE patient_queue 0 -1
 
 ⚠️ IMPORTANT:
 The agent's autonomous behavior depends on:
@@ -1,4 +1,9 @@
+import functools
+import hashlib
+import json
 import os
+import sys
+import time
 from dotenv import load_dotenv
 load_dotenv("tools/.env")
 
@@ -13,51 +18,106 @@ if not api_key:
 
 genai.configure(api_key=api_key)
 
+# list_models() is a network call; cache it on disk for an hour per API key.
+# Pass --no-cache to check the key against the API right now.
+USE_CACHE = "--no-cache" not in sys.argv[1:]
+MODELS_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".cache", "medisync",
+    f"models_{hashlib.sha256(api_key.encode()).hexdigest()[:12]}.json",
+)
+MODELS_CACHE_TTL = 3600
+
+
+@functools.lru_cache(maxsize=1)
+def _models():
+    """Return model metadata as plain dicts, using the on-disk cache if fresh"""
+    if USE_CACHE:
+        try:
+            age = time.time() - os.path.getmtime(MODELS_CACHE_PATH)
+            if age < MODELS_CACHE_TTL:
+                with open(MODELS_CACHE_PATH, encoding="utf-8") as f:
+                    models = json.load(f)
+                print(f"⚠️  Showing cached result from {age / 60:.0f} min ago "
+                      f"(run with --no-cache to query the API now)")
+                return models
+        except (OSError, ValueError):
+            pass
+
+    models = [
+        {
+            "name": m.name,
+            "display_name": m.display_name,
+            "description": m.description or "",
+            "input_token_limit": m.input_token_limit,
+            "output_token_limit": m.output_token_limit,
+            "supported_generation_methods": list(m.supported_generation_methods),
+        }
+        for m in genai.list_models()
+    ]
+    try:
+        os.makedirs(os.path.dirname(MODELS_CACHE_PATH), exist_ok=True)
+        with open(MODELS_CACHE_PATH, "w", encoding="utf-8") as f:
+            json.dump(models, f)
+    except OSError:
+        pass
+    return models
+
+
 print("\n" + "=" * 70)
 print("📋 LISTING ALL AVAILABLE GEMINI MODELS")
 print("=" * 70 + "\n")
 
 try:
-    models = genai.list_models()
+    models = _models()
     
     working_models = []
+    lines = []
     
     for model in models:
         # Check if model supports generateContent (required for ADK)
-        if 'generateContent' in model.supported_generation_methods:
-            model_name = model.name.replace('models/', '')
+        if 'generateContent' in model['supported_generation_methods']:
+            model_name = model['name'].replace('models/', '')
             working_models.append(model_name)
             
-            print(f"✅ {model_name}")
-            print(f"   Display Name: {model.display_name}")
-            print(f"   Description: {model.description[:80]}...")
-            print(f"   Input Token Limit: {model.input_token_limit:,}")
-            print(f"   Output Token Limit: {model.output_token_limit:,}")
-            print()
+            lines.append(
+                f"✅ {model_name}\n"
+                f"   Display Name: {model['display_name']}\n"
+                f"   Description: {model['description'][:80]}...\n"
+                f"   Input Token Limit: {model['input_token_limit']:,}\n"
+                f"   Output Token Limit: {model['output_token_limit']:,}\n"
+            )
     
-    print("=" * 70)
-    print(f"✅ FOUND {len(working_models)} WORKING MODELS")
-    print("=" * 70)
+    lines.append("=" * 70)
+    lines.append(f"✅ FOUND {len(working_models)} WORKING MODELS")
+    lines.append("=" * 70)
     
     if working_models:
-        print("\n🎯 RECOMMENDED FOR ADK (copy one of these to root_agent.py):\n")
-        for i, model_name in enumerate(working_models[:3], 1):
-            print(f"   {i}. model=\"{model_name}\"")
-        
-        print("\n📝 UPDATE YOUR root_agent.py:")
-        print(f"\n   root_agent = LlmAgent(")
-        print(f"       model=\"{working_models[0]}\",  # ← Use this!")
-        print(f"       name=\"MediSyncIntelligentSystem\",")
-        print(f"       ...")
-        print(f"   )")
+        lines.append("\n🎯 RECOMMENDED FOR ADK (copy one of these to root_agent.py):\n")
+        lines.extend(
+            f"   {i}. model=\"{model_name}\""
+            for i, model_name in enumerate(working_models[:3], 1)
+        )
+        lines.append(f"""
+📝 UPDATE YOUR root_agent.py:
+
+   root_agent = LlmAgent(
+       model="{working_models[0]}",  # ← Use this!
+       name="MediSyncIntelligentSystem",
+       ...
+   )""")
     else:
-        print("\n❌ NO MODELS FOUND!")
-        print("\n🔧 POSSIBLE ISSUES:")
-        print("1. API key might be invalid")
-        print("2. Account might not have access to Gemini API")
-        print("3. Need to enable Gemini API in Google Cloud Console")
-        print("\n🆕 GET A NEW API KEY:")
-        print("   https://aistudio.google.com/apikey")
+        lines.append("""
+❌ NO MODELS FOUND!
+
+🔧 POSSIBLE ISSUES:
+1. API key might be invalid
+2. Account might not have access to Gemini API
+3. Need to enable Gemini API in Google Cloud Console
+
+🆕 GET A NEW API KEY:
+   https://aistudio.google.com/apikey""")
+    
+    sys.stdout.write("\n".join(lines) + "\n")
     
 except Exception as e:
     print(f"\n❌ ERROR: {e}")
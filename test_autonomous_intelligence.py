@@ -6,20 +6,21 @@ not just when explicitly told.
 
 import os
 import sys
-import json
-import redis
 from datetime import datetime
 from dotenv import load_dotenv
 
 # Load environment
 load_dotenv("tools/.env")
 
+# tools.* connect to Redis at import time, so import them once env is loaded
+from tools.clinic_tools import book_intelligent_patient_appointment, patient_queue_urgency
+from tools.queue_brain import analyze_and_optimize_queue
+from tools.orchestrator_brain import monitor_and_trigger_orchestration
+from tools.json_utils import json_loads
+from tools.redis_client import get_redis
+
 # Setup Redis
-redis_client = redis.Redis(
-    host=os.getenv("REDIS_HOST", "localhost"),
-    port=int(os.getenv("REDIS_PORT", 6379)),
-    decode_responses=True,
-)
+redis_client = get_redis()
 
 print("\n" + "=" * 80)
 print("🧠 AUTONOMOUS INTELLIGENCE TEST - Does Agent Make Smart Decisions?")
@@ -36,8 +37,6 @@ print()
 print("Setting up test scenario...")
 redis_client.delete("patient_queue")  # Clear queue
 
-from tools.clinic_tools import book_intelligent_patient_appointment
-
 # Book 3 low-urgency patients
 low_urgency_patients = [
     ("Patient A", "+91-9999900001", "routine checkup", "Bandra, Mumbai"),
@@ -48,7 +47,7 @@ low_urgency_patients = [
 for name, contact, symptoms, location in low_urgency_patients:
     book_intelligent_patient_appointment(name, contact, symptoms, location)
     
-print(f"✅ Created queue with {redis_client.llen('patient_queue')} low-urgency patients\n")
+print(f"✅ Created queue with {redis_client.zcard('patient_queue')} low-urgency patients\n")
 
 # Now test if agent recognizes this scenario
 print("=" * 70)
@@ -65,15 +64,16 @@ print("   4. ✓ Reorder queue to prioritize emergency patient")
 print()
 
 # Get initial queue state
-initial_queue = []
-for i in range(redis_client.llen("patient_queue")):
-    patient_json = redis_client.lindex("patient_queue", i)
-    patient = json.loads(patient_json)
-    initial_queue.append((patient['token_number'], patient['name'], patient['symptoms_analysis']['urgency_score']))
+initial_queue = [
+    (patient['token_number'], patient['name'], patient['symptoms_analysis']['urgency_score'])
+    for patient in map(json_loads, redis_client.zrange("patient_queue", 0, -1))
+]
 
 print("Initial Queue Order:")
-for pos, (token, name, urgency) in enumerate(initial_queue, 1):
-    print(f"   {pos}. Token #{token}: {name} (Urgency: {urgency}/10)")
+print("\n".join(
+    f"   {pos}. Token #{token}: {name} (Urgency: {urgency}/10)"
+    for pos, (token, name, urgency) in enumerate(initial_queue, 1)
+))
 
 # Book emergency patient
 print("\n📞 Booking emergency patient...")
@@ -86,15 +86,16 @@ result = book_intelligent_patient_appointment(
 
 # Check if optimization was triggered
 print("\n🔍 Checking if queue was optimized...")
-final_queue = []
-for i in range(redis_client.llen("patient_queue")):
-    patient_json = redis_client.lindex("patient_queue", i)
-    patient = json.loads(patient_json)
-    final_queue.append((patient['token_number'], patient['name'], patient['symptoms_analysis']['urgency_score']))
+final_queue = [
+    (patient['token_number'], patient['name'], patient['symptoms_analysis']['urgency_score'])
+    for patient in map(json_loads, redis_client.zrange("patient_queue", 0, -1))
+]
 
 print("\nFinal Queue Order:")
-for pos, (token, name, urgency) in enumerate(final_queue, 1):
-    print(f"   {pos}. Token #{token}: {name} (Urgency: {urgency}/10)")
+print("\n".join(
+    f"   {pos}. Token #{token}: {name} (Urgency: {urgency}/10)"
+    for pos, (token, name, urgency) in enumerate(final_queue, 1)
+))
 
 # Analyze if optimization happened
 emergency_patient_pos = None
@@ -117,8 +118,6 @@ else:
 print("\n\n2️⃣ TEST: Queue Brain Optimization Logic")
 print("-" * 70)
 
-from tools.queue_brain import analyze_and_optimize_queue
-
 print("Calling analyze_and_optimize_queue()...")
 optimization_result = analyze_and_optimize_queue()
 
@@ -137,12 +136,11 @@ print(optimization_result[:500] + "...")
 print("\n\n3️⃣ TEST: Verify Redis Queue Reordering")
 print("-" * 70)
 
-# Get current queue urgency scores
-urgency_order = []
-for i in range(redis_client.llen("patient_queue")):
-    patient_json = redis_client.lindex("patient_queue", i)
-    patient = json.loads(patient_json)
-    urgency_order.append(patient['symptoms_analysis']['urgency_score'])
+# Urgency is encoded in each ZSET score, so no patient JSON is parsed here
+urgency_order = [
+    patient_queue_urgency(score)
+    for _, score in redis_client.zrange("patient_queue", 0, -1, withscores=True)
+]
 
 print(f"Queue Urgency Order: {urgency_order}")
 
@@ -160,8 +158,6 @@ else:
 print("\n\n4️⃣ TEST: Orchestrator Auto-Trigger Intelligence")
 print("-" * 70)
 
-from tools.orchestrator_brain import monitor_and_trigger_orchestration
-
 print("Calling monitor_and_trigger_orchestration()...")
 orchestration_check = monitor_and_trigger_orchestration()
 
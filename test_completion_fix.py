@@ -3,16 +3,11 @@ Test script to verify patient completion/dequeue functionality works correctly
 Tests the fixed clinic_monitor.py integration with priority_queue_manager
 """
 
-import os
-import sys
-import redis
 from datetime import datetime, timedelta
 
-# Add project root to path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
 from tools.priority_queue_manager import get_priority_queue_manager
 from tools.clinic_monitor import mark_patient_completed
+from tools.redis_client import get_redis
 
 def test_completion_workflow():
     """Test complete booking → completion → dequeue workflow"""
@@ -23,13 +18,7 @@ def test_completion_workflow():
     
     # Initialize Redis and Priority Queue Manager
     try:
-        redis_client = redis.Redis(
-            host=os.getenv("REDIS_HOST", "localhost"),
-            port=int(os.getenv("REDIS_PORT", 6379)),
-            password=os.getenv("REDIS_PASSWORD", None),
-            db=0,
-            decode_responses=True
-        )
+        redis_client = get_redis()
         redis_client.ping()
         print("✅ Connected to Redis")
     except Exception as e:
@@ -41,9 +30,7 @@ def test_completion_workflow():
     print("✅ Priority Queue Manager initialized")
     
     # Clear existing queue for clean test
-    pq_manager.main_queue.clear()
-    pq_manager.emergency_queue.clear()
-    pq_manager.patient_map.clear()
+    pq_manager.clear()
     pq_manager.global_patient_counter = 0
     print("✅ Queue cleared for testing")
     
@@ -118,8 +105,7 @@ def test_completion_workflow():
     ]
     
     booked_tokens = []
-    for patient_data in test_patients:
-        patient_node = pq_manager.enqueue_patient(patient_data)
+    for patient_node in pq_manager.enqueue_batch(test_patients):
         booked_tokens.append(patient_node.token_number)
         is_emergency = patient_node.emergency_level == 2  # CRITICAL = 2
         print(f"  ✅ Booked: {patient_node.name} (Token #{patient_node.token_number}, Emergency: {is_emergency})")
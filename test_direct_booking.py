@@ -1,10 +1,5 @@
-import sys
-import os
 import json
 
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
 from tools.clinic_tools_priority_queue import book_intelligent_patient_appointment
 
 # Test booking
@@ -7,13 +7,16 @@ import json
 
 BASE_URL = "http://localhost:3000/api/v1"
 
+# Reuse one keep-alive connection across requests
+session = requests.Session()
+
 print("\n🧪 Testing ETA Calculation Fix...")
 print("=" * 60)
 
 # Test direct ETA endpoint
 print("\n📊 Test 1: Direct ETA Calculation")
 try:
-    response = requests.get(f"{BASE_URL}/queue/etas", timeout=15)
+    response = session.get(f"{BASE_URL}/queue/etas", timeout=15)
     print(f"Status: {response.status_code}")
     
     if response.status_code == 200:
@@ -39,7 +42,7 @@ booking_data = {
 }
 
 try:
-    response = requests.post(
+    response = session.post(
         f"{BASE_URL}/appointments/book",
         json=booking_data,
         timeout=20
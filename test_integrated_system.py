@@ -4,8 +4,6 @@ Tests all components working together
 """
 
 import sys
-import os
-sys.path.insert(0, os.path.dirname(__file__))
 
 print("\n" + "=" * 80)
 print("🔬 INTEGRATED SYSTEM TEST - Priority Queue with ADK")
@@ -51,13 +49,9 @@ print("2️⃣ TEST: System Initialization")
 print("-" * 70)
 
 try:
-    import redis
+    from tools.redis_client import get_redis
     
-    redis_client = redis.Redis(
-        host='localhost',
-        port=6379,
-        decode_responses=True
-    )
+    redis_client = get_redis()
     redis_client.ping()
     print("✅ Redis connection: OK")
     
@@ -1,53 +1,58 @@
-import sys
-import os
 from datetime import datetime
 
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
 from tools.mongodb_utils import get_mongodb_manager, PatientModel
 
 # Initialize MongoDB
 manager = get_mongodb_manager()
 patient_model = PatientModel()
 
-# Create a simple test patient
-test_patient = {
-    "tokenNumber": 999,
-    "name": "Manual Test Patient",
-    "contactNumber": "0000000000",
-    "symptoms": "manual test",
-    "symptomsAnalysis": {},
-    "location": "Test Location",
-    "travelData": {},
-    "priorityScore": 50.0,
-    "emergencyLevel": "NORMAL",
-    "travelEtaMins": 20,
-    "predictedConsultMins": 15,
-    "waitingTimeMins": 0.0,
-    "arrivalProbability": 1.0,
-    "bookingTime": datetime.utcnow(),
-    "lastPriorityUpdate": datetime.utcnow(),
-    "status": "WAITING",
-    "isActive": True,
-}
-
-print("Creating patient...")
-result = patient_model.create(test_patient)
-
-if result:
+# Create test patients (inserted together in one round trip)
+TEST_TOKENS = [999, 998, 997]
+now = datetime.utcnow()
+
+test_patients = [
+    {
+        "tokenNumber": token,
+        "name": f"Manual Test Patient {token}",
+        "contactNumber": "0000000000",
+        "symptoms": "manual test",
+        "symptomsAnalysis": {},
+        "location": "Test Location",
+        "travelData": {},
+        "priorityScore": 50.0,
+        "emergencyLevel": "NORMAL",
+        "travelEtaMins": 20,
+        "predictedConsultMins": 15,
+        "waitingTimeMins": 0.0,
+        "arrivalProbability": 1.0,
+        "bookingTime": now,
+        "lastPriorityUpdate": now,
+        "status": "WAITING",
+        "isActive": True,
+    }
+    for token in TEST_TOKENS
+]
+
+print(f"Creating {len(test_patients)} patients...")
+created = patient_model.create_many(test_patients)
+
+for result in created:
     print(f"✅ Patient created successfully: {result['_id']}")
     
     # Verify it exists
-    found = patient_model.find_by_token(999)
+    found = patient_model.find_by_token(result["tokenNumber"])
     if found:
         print(f"✅ Patient found in database: Token #{found['tokenNumber']}")
     else:
         print("❌ Patient NOT found in database!")
-else:
-    print("❌ Failed to create patient")
+
+if len(created) < len(test_patients):
+    print(f"❌ Failed to create {len(test_patients) - len(created)} patients")
 
 # List all patients
-all_patients = list(patient_model.collection.find({}))
+all_patients = list(
+    patient_model.collection.find({}, {"tokenNumber": 1, "name": 1, "_id": 0}).sort("tokenNumber", 1)
+)
 print(f"\nTotal patients in database: {len(all_patients)}")
 for p in all_patients:
     print(f"  Token #{p['tokenNumber']}: {p['name']}")
@@ -1,8 +1,3 @@
-import sys
-import os
-
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
 from tools.mongodb_utils import get_mongodb_manager
 
 # Get MongoDB manager
@@ -19,16 +14,16 @@ print(f"Database: {db}")
 print(f"Full database names: {client.list_database_names()}")
 print(f"\nCollections in '{db.name}':")
 for collection_name in db.list_collection_names():
-    count = db[collection_name].count_documents({})
+    count = db[collection_name].estimated_document_count()  # metadata count, no scan
     print(f"  - {collection_name}: {count} documents")
 
 print(f"\nPatients collection details:")
 patients_coll = db.patients
 print(f"  Full name: {patients_coll.full_name}")
 print(f"  Database: {patients_coll.database.name}")
-print(f"  Count: {patients_coll.count_documents({})}")
+print(f"  Count: {patients_coll.estimated_document_count()}")
 
 # List actual patient documents
 print(f"\nActual patients:")
-for p in patients_coll.find({}, {"tokenNumber": 1, "name": 1}):
+for p in patients_coll.find({}, {"tokenNumber": 1, "name": 1, "_id": 0}).sort("tokenNumber", 1):
     print(f"  Token #{p['tokenNumber']}: {p['name']}")
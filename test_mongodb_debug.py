@@ -1,9 +1,5 @@
-import sys
 import os
 
-# Add parent directory to path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
 from tools.mongodb_utils import get_mongodb_manager, PatientModel
 
 # Get MongoDB manager
@@ -24,7 +20,11 @@ for p in patients:
 
 # Get all patients (not just active)
 if patient_model.collection:
-    all_patients = list(patient_model.collection.find({}))
+    all_patients = list(
+        patient_model.collection.find(
+            {}, {"tokenNumber": 1, "name": 1, "status": 1, "_id": 0}
+        ).sort("tokenNumber", 1)
+    )
     print(f"\nAll patients in collection: {len(all_patients)}")
     for p in all_patients:
         print(f"  Token #{p['tokenNumber']}: {p['name']} (Status: {p.get('status', 'Unknown')})")
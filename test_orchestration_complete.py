@@ -7,6 +7,13 @@ import json
 
 BASE_URL = "http://localhost:3000/api/v1"
 
+# Reuse one keep-alive connection across requests
+session = requests.Session()
+
+def format_result(result):
+    """Pretty-print an orchestration action result"""
+    return json.dumps(result, indent=2, default=str)
+
 def test_booking_with_orchestration():
     """Test booking a patient with full orchestration enabled"""
     print("🧪 Testing booking with complete orchestration...")
@@ -23,7 +30,7 @@ def test_booking_with_orchestration():
     print(f"\n📝 Booking patient: {booking_data['name']}")
     print(f"   Symptoms: {booking_data['symptoms']}")
     
-    response = requests.post(
+    response = session.post(
         f"{BASE_URL}/appointments/book",
         json=booking_data,
         headers={"Content-Type": "application/json"}
@@ -54,7 +61,7 @@ def test_booking_with_orchestration():
                 if not action.get('success') and action.get('error'):
                     print(f"      Error: {action.get('error')}")
                 if action.get('result'):
-                    print(f"      Result: {json.dumps(action.get('result'), indent=6)}")
+                    print(f"      Result: {format_result(action['result'])}")
         
         return True
     else:
@@ -67,7 +74,7 @@ def test_queue_stats():
     print(f"\n\n📊 Fetching Queue Statistics...")
     print("=" * 60)
     
-    response = requests.get(f"{BASE_URL}/queue/stats")
+    response = session.get(f"{BASE_URL}/queue/stats")
     
     if response.status_code == 200:
         stats = response.json()
@@ -4,10 +4,9 @@ Tests: Min-Heap, A* ETA, Aging, Emergency Handling, Dynamic Reordering
 """
 
 import sys
-import os
 
-# Ensure imports work
-sys.path.insert(0, os.path.dirname(__file__))
+EMERGENCY_LABELS = ("Normal", "Priority", "Critical")
+QUEUE_PRINT_LIMIT = 10  # Listings only serialize the top of the queue
 
 print("\n" + "=" * 80)
 print("🚀 ADVANCED PRIORITY QUEUE SYSTEM - COMPREHENSIVE TEST")
@@ -88,28 +87,30 @@ test_patients = [
 ]
 
 print("Booking 3 patients with different urgency levels...")
-for patient_data in test_patients:
-    patient_node = pq_manager.enqueue_patient(patient_data)
+patient_nodes = pq_manager.enqueue_batch(test_patients)
+for patient_node in patient_nodes:
     print(f"   Token #{patient_node.token_number}: {patient_node.name}")
-    print(f"      Urgency: {patient_data['symptoms_analysis']['urgency_score']}/10")
+    print(f"      Urgency: {patient_node.symptoms_analysis['urgency_score']}/10")
     print(f"      Priority Score: {patient_node.priority_score:.2f}")
-    print(f"      Emergency Level: {['Normal', 'Priority', 'Critical'][patient_node.emergency_level]}")
+    print(f"      Emergency Level: {EMERGENCY_LABELS[patient_node.emergency_level]}")
 
 # Test 4: Queue Ordering
 print("\n4️⃣ TEST: Intelligent Queue Ordering")
 print("-" * 70)
 
-queue_snapshot = pq_manager.get_queue_snapshot()
+queue_snapshot = pq_manager.get_queue_head(QUEUE_PRINT_LIMIT)
 print(f"Total patients in queue: {queue_snapshot['total_patients']}")
 print(f"Emergency queue: {queue_snapshot['emergency_count']}")
 print(f"Main queue: {queue_snapshot['main_queue_count']}")
 print("\nQueue Order (by priority):")
 
+lines = []
 for i, patient in enumerate(queue_snapshot['patients'], 1):
-    print(f"   {i}. Token #{patient['token_number']}: {patient['name']}")
-    print(f"      Priority: {patient['priority_score']:.2f}, "
-          f"Emergency: {patient['emergency_level']}, "
-          f"Wait: {patient['waiting_time_mins']:.0f} mins")
+    lines.append(f"   {i}. Token #{patient['token_number']}: {patient['name']}\n")
+    lines.append(f"      Priority: {patient['priority_score']:.2f}, "
+                 f"Emergency: {patient['emergency_level']}, "
+                 f"Wait: {patient['waiting_time_mins']:.0f} mins\n")
+sys.stdout.write("".join(lines))
 
 # Verify high-priority patient is first
 if queue_snapshot['patients'][0]['name'] == "High Priority Patient":
@@ -125,7 +126,7 @@ next_patient = pq_manager.dequeue_next_patient()
 if next_patient:
     print(f"✅ Dequeued: Token #{next_patient.token_number} - {next_patient.name}")
     print(f"   This patient had priority score: {next_patient.priority_score:.2f}")
-    print(f"   Emergency level: {['Normal', 'Priority', 'Critical'][next_patient.emergency_level]}")
+    print(f"   Emergency level: {EMERGENCY_LABELS[next_patient.emergency_level]}")
 else:
     print("❌ Queue is empty!")
 
@@ -136,12 +137,14 @@ print("-" * 70)
 print("Simulating 10 minutes of waiting time...")
 pq_manager.apply_aging(elapsed_mins=10.0)
 
-queue_after_aging = pq_manager.get_queue_snapshot()
+queue_after_aging = pq_manager.get_queue_head(QUEUE_PRINT_LIMIT)
 print("\nQueue order after aging:")
+lines = []
 for i, patient in enumerate(queue_after_aging['patients'], 1):
-    print(f"   {i}. Token #{patient['token_number']}: {patient['name']}")
-    print(f"      Priority: {patient['priority_score']:.2f}, "
-          f"Wait: {patient['waiting_time_mins']:.0f} mins")
+    lines.append(f"   {i}. Token #{patient['token_number']}: {patient['name']}\n")
+    lines.append(f"      Priority: {patient['priority_score']:.2f}, "
+                 f"Wait: {patient['waiting_time_mins']:.0f} mins\n")
+sys.stdout.write("".join(lines))
 
 print("\n✅ PASS: Aging algorithm applied - waiting patients get priority boost")
 
@@ -161,14 +164,16 @@ emergency_patient = {
 
 print("Booking CRITICAL emergency patient...")
 emergency_node = pq_manager.enqueue_patient(emergency_patient)
-print(f"   Emergency Level: {['Normal', 'Priority', 'Critical'][emergency_node.emergency_level]}")
+print(f"   Emergency Level: {EMERGENCY_LABELS[emergency_node.emergency_level]}")
 
-queue_with_emergency = pq_manager.get_queue_snapshot()
+queue_with_emergency = pq_manager.get_queue_head(QUEUE_PRINT_LIMIT)
 print(f"\nEmergency queue count: {queue_with_emergency['emergency_count']}")
 print("Current queue order:")
+lines = []
 for i, patient in enumerate(queue_with_emergency['patients'], 1):
     emergency_marker = "🚨" if patient['emergency_level'] == 'CRITICAL' else "📋"
-    print(f"   {emergency_marker} {i}. Token #{patient['token_number']}: {patient['name']}")
+    lines.append(f"   {emergency_marker} {i}. Token #{patient['token_number']}: {patient['name']}\n")
+sys.stdout.write("".join(lines))
 
 # Verify emergency is first
 if queue_with_emergency['emergency_count'] > 0:
@@ -182,7 +187,7 @@ print("-" * 70)
 
 if len(pq_manager.patient_map) > 0:
     # Get first patient token
-    test_token = list(pq_manager.patient_map.keys())[0]
+    test_token = next(iter(pq_manager.patient_map))
     patient_before = pq_manager.patient_map[test_token]
     
     print(f"Patient Token #{test_token} before update:")
@@ -208,7 +213,7 @@ print("\n\n" + "=" * 80)
 print("📊 TEST SUMMARY")
 print("=" * 80)
 
-final_snapshot = pq_manager.get_queue_snapshot()
+final_snapshot = pq_manager.get_queue_head(0)
 
 print(f"""
 ✅ ALL SYSTEMS OPERATIONAL
@@ -4,8 +4,7 @@ This test ACTUALLY calls the booking functions and verifies the queue data struc
 """
 
 import sys
-import os
-sys.path.insert(0, os.path.dirname(__file__))
+from itertools import islice
 
 print("\n" + "=" * 80)
 print("🔬 REAL BOOKING FLOW TEST - Verify Data Structures Actually Work")
@@ -14,13 +13,13 @@ print()
 
 # Import real booking functions
 from tools.clinic_tools_priority_queue import book_intelligent_patient_appointment
-from tools.priority_queue_manager import get_priority_queue_manager
+from tools.priority_queue_manager import get_priority_queue_manager, EMERGENCY_LEVEL_NAMES
 from tools.astar_eta_calculator import get_astar_eta_calculator
-import redis
+from tools.redis_client import get_redis
 import json
 
 # Initialize
-redis_client = redis.Redis(host='localhost', port=6379, decode_responses=True)
+redis_client = get_redis()
 redis_client.ping()
 print("✅ Redis connected\n")
 
@@ -47,7 +46,7 @@ print(result1)
 print()
 
 # Verify data structure
-snapshot1 = pq_manager.get_queue_snapshot()
+snapshot1 = pq_manager.get_queue_head(1)
 print("🔍 DATA STRUCTURE CHECK AFTER BOOKING 1:")
 print(f"   Total Patients in Queue: {snapshot1['total_patients']}")
 print(f"   Emergency Queue (Max-Heap): {snapshot1['emergency_count']}")
@@ -96,9 +95,11 @@ print(f"   Main Queue: {snapshot2['main_queue_count']}")
 
 if len(snapshot2['patients']) >= 2:
     print(f"\n   📊 Queue Order (Min-Heap sorting):")
+    lines = []
     for i, p in enumerate(snapshot2['patients'], 1):
-        print(f"      Position #{i}: Token #{p['token_number']} - {p['name']}")
-        print(f"         Priority: {p['priority_score']:.2f}, Emergency: {p['emergency_level']}")
+        lines.append(f"      Position #{i}: Token #{p['token_number']} - {p['name']}\n")
+        lines.append(f"         Priority: {p['priority_score']:.2f}, Emergency: {p['emergency_level']}\n")
+    sys.stdout.write("".join(lines))
 else:
     print(f"\n   ⚠️ Expected 2 patients, found {len(snapshot2['patients'])}")
 
@@ -123,11 +124,13 @@ print(f"   Emergency Queue (Max-Heap): {snapshot3['emergency_count']}")
 print(f"   Main Queue (Min-Heap): {snapshot3['main_queue_count']}")
 
 print(f"\n   📊 Complete Queue Order (Emergency First):")
+lines = []
 for i, p in enumerate(snapshot3['patients'], 1):
     emoji = "🚨" if p['emergency_level'] in ['PRIORITY', 'CRITICAL'] else "📋"
-    print(f"      {emoji} Position #{i}: Token #{p['token_number']} - {p['name']}")
-    print(f"         Priority: {p['priority_score']:.2f}, Emergency: {p['emergency_level']}")
-    print(f"         Travel ETA: {p['travel_eta_mins']:.0f} mins, Waiting: {p['waiting_time_mins']:.0f} mins")
+    lines.append(f"      {emoji} Position #{i}: Token #{p['token_number']} - {p['name']}\n")
+    lines.append(f"         Priority: {p['priority_score']:.2f}, Emergency: {p['emergency_level']}\n")
+    lines.append(f"         Travel ETA: {p['travel_eta_mins']:.0f} mins, Waiting: {p['waiting_time_mins']:.0f} mins\n")
+sys.stdout.write("".join(lines))
 
 # Verify emergency patient is first
 if snapshot3['patients']:
@@ -145,7 +148,7 @@ next_patient = pq_manager.dequeue_next_patient()
 if next_patient:
     print(f"✅ Dequeued: Token #{next_patient.token_number} - {next_patient.name}")
     print(f"   Priority Score: {next_patient.priority_score:.2f}")
-    print(f"   Emergency Level: {['NORMAL', 'PRIORITY', 'CRITICAL'][next_patient.emergency_level]}")
+    print(f"   Emergency Level: {EMERGENCY_LEVEL_NAMES[next_patient.emergency_level]}")
     
     if next_patient.name == "Amit Patel":
         print(f"\n   ✅ VERIFIED: Emergency patient dequeued first (CORRECT!)")
@@ -154,7 +157,7 @@ if next_patient:
 else:
     print("❌ ERROR: Dequeue returned None!")
 
-snapshot4 = pq_manager.get_queue_snapshot()
+snapshot4 = pq_manager.get_queue_head(0)
 print(f"\n🔍 QUEUE AFTER DEQUEUE:")
 print(f"   Total Patients: {snapshot4['total_patients']}")
 print(f"   Total Dequeued (Lifetime): {snapshot4['statistics']['total_dequeued']}")
@@ -168,9 +171,11 @@ pq_manager.apply_aging(elapsed_mins=10.0)
 
 snapshot5 = pq_manager.get_queue_snapshot()
 print(f"\n🔍 QUEUE AFTER AGING:")
+lines = []
 for i, p in enumerate(snapshot5['patients'], 1):
-    print(f"   Position #{i}: Token #{p['token_number']} - {p['name']}")
-    print(f"      Priority: {p['priority_score']:.2f}, Waiting: {p['waiting_time_mins']:.0f} mins")
+    lines.append(f"   Position #{i}: Token #{p['token_number']} - {p['name']}\n")
+    lines.append(f"      Priority: {p['priority_score']:.2f}, Waiting: {p['waiting_time_mins']:.0f} mins\n")
+sys.stdout.write("".join(lines))
 
 # Check if priorities improved (became lower/better)
 print("\n   ✅ VERIFIED: Aging algorithm applied (priorities boosted by waiting time)")
@@ -194,28 +199,21 @@ else:
 
 print("\n3️⃣ HashMap Verification:")
 print(f"   HashMap Size: {len(pq_manager.patient_map)} patients")
-for token, node in list(pq_manager.patient_map.items())[:3]:
+for token, node in islice(pq_manager.patient_map.items(), 3):
     print(f"   Map[{token}]: {node.name}, Priority: {node.priority_score:.2f}")
 
 print("\n4️⃣ Heap Property Verification:")
-# Verify min-heap property (parent <= children)
-heap_valid = True
-for i in range(len(pq_manager.main_queue) // 2):
-    parent = pq_manager.main_queue[i]
-    left_idx = 2 * i + 1
-    right_idx = 2 * i + 2
-    
-    if left_idx < len(pq_manager.main_queue):
-        left = pq_manager.main_queue[left_idx]
-        if parent.priority_score > left.priority_score:
-            heap_valid = False
-            print(f"   ❌ Heap violation: Parent[{i}]={parent.priority_score:.2f} > Left={left.priority_score:.2f}")
-    
-    if right_idx < len(pq_manager.main_queue):
-        right = pq_manager.main_queue[right_idx]
-        if parent.priority_score > right.priority_score:
-            heap_valid = False
-            print(f"   ❌ Heap violation: Parent[{i}]={parent.priority_score:.2f} > Right={right.priority_score:.2f}")
+# Verify min-heap property (parent <= children) on scores extracted once
+scores = [node.priority_score for node in pq_manager.main_queue]
+violations = [
+    child_idx for child_idx in range(1, len(scores))
+    if scores[(child_idx - 1) // 2] > scores[child_idx]
+]
+heap_valid = not violations
+for child_idx in violations:
+    i = (child_idx - 1) // 2
+    side = "Left" if child_idx % 2 else "Right"
+    print(f"   ❌ Heap violation: Parent[{i}]={scores[i]:.2f} > {side}={scores[child_idx]:.2f}")
 
 if heap_valid:
     print("   ✅ Min-Heap property VALID (all parents ≤ children)")
@@ -9,12 +9,13 @@ from datetime import datetime
 from typing import Dict, List
 import sys
 import os
-import redis
+from redis import asyncio as aioredis
 
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from tools.free_maps import FreeMapsService
+from tools.json_utils import json_dumps
 
 # Import the root agent to test actual workflow
 try:
@@ -101,6 +102,9 @@ TEST_CASES = [
     },
 ]
 
+# Test cases run concurrently, at most this many against the agent at once
+MAX_CONCURRENT_TESTS = 4
+
 class AgenticWorkflowTester:
     """Test the complete agentic workflow using root agent"""
     
@@ -108,37 +112,53 @@ class AgenticWorkflowTester:
         self.maps_service = FreeMapsService()
         self.results = []
         
-        # Connect to Redis to check actual queue
+        # Limit how many test cases hit the agent at once
+        self._sem = asyncio.Semaphore(MAX_CONCURRENT_TESTS)
+        
+        # Async Redis client so queue reads don't block the event loop;
+        # same server settings as tools/redis_client
+        self.redis_client = aioredis.Redis(
+            host=os.getenv("REDIS_HOST", "localhost"),
+            port=int(os.getenv("REDIS_PORT", 6379)),
+            password=os.getenv("REDIS_PASSWORD", None),
+            decode_responses=True,
+            max_connections=16
+        )
+    
+    async def connect_redis(self):
+        """Check the Redis connection used for queue monitoring"""
         try:
-            self.redis_client = redis.Redis(
-                host='localhost',
-                port=6379,
-                decode_responses=True
-            )
-            self.redis_client.ping()
+            await self.redis_client.ping()
             print("✅ Connected to Redis for queue monitoring")
         except Exception as e:
             print(f"⚠️ Could not connect to Redis: {e}")
             self.redis_client = None
     
-    def get_redis_queue_status(self):
-        """Get actual queue status from Redis"""
+    async def _scan_keys(self, pattern):
+        """Collect keys matching a glob pattern using a server-side SCAN"""
+        return [k async for k in self.redis_client.scan_iter(match=pattern, count=1000)]
+    
+    async def get_redis_queue_status(self, include_values=True):
+        """Get actual queue status from Redis
+        
+        Args:
+            include_values: Also read queue contents and sample patients;
+                False returns only the categorized key names
+        """
         if not self.redis_client:
             return None
         
         try:
-            # Get all Redis keys
-            all_keys = self.redis_client.keys('*')
-            
-            # Categorize keys
-            queue_keys = [k for k in all_keys if 'queue' in k.lower()]
-            patient_keys = [k for k in all_keys if 'patient' in k.lower()]
-            brain_keys = [k for k in all_keys if 'brain' in k.lower()]
-            symptom_keys = [k for k in all_keys if 'symptom' in k.lower()]
-            starvation_keys = [k for k in all_keys if 'starv' in k.lower()]
+            # Filter keys on the server, one SCAN MATCH per category, run concurrently
+            patterns = ['*queue*', '*patient*', '*brain*', '*symptom*', '*starv*']
+            total_keys, *matches = await asyncio.gather(
+                self.redis_client.dbsize(),
+                *(self._scan_keys(pattern) for pattern in patterns)
+            )
+            queue_keys, patient_keys, brain_keys, symptom_keys, starvation_keys = matches
             
             queue_data = {
-                'all_keys': all_keys,
+                'total_keys': total_keys,
                 'queue_keys': queue_keys,
                 'patient_keys': patient_keys,
                 'brain_keys': brain_keys,
@@ -148,45 +168,50 @@ class AgenticWorkflowTester:
                 'queue_data': {}
             }
             
+            if not include_values:
+                return queue_data
+            
+            # Look up every key type in one round trip
+            patient_sample = patient_keys[:20]  # Limit to first 20
+            type_keys = queue_keys + patient_sample
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key in type_keys:
+                pipe.type(key)
+            key_types = dict(zip(type_keys, await pipe.execute()))
+            
+            # Queue the type-specific reads and fetch them in a second round trip
+            readers = {
+                'list': lambda p, k: p.lrange(k, 0, -1),
+                'string': lambda p, k: p.get(k),
+                'hash': lambda p, k: p.hgetall(k),
+                'zset': lambda p, k: p.zrange(k, 0, -1, withscores=True),
+            }
+            queue_reads = [k for k in queue_keys if key_types[k] in readers]
+            patient_reads = [k for k in patient_sample if key_types[k] in ('hash', 'string')]
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key in queue_reads + patient_reads:
+                readers[key_types[key]](pipe, key)
+            values = await pipe.execute()
+            
             # Get queue data
-            for key in queue_keys:
-                key_type = self.redis_client.type(key)
-                if key_type == 'list':
-                    queue_data['queue_data'][key] = {
-                        'type': 'list',
-                        'data': self.redis_client.lrange(key, 0, -1)
-                    }
-                elif key_type == 'string':
-                    queue_data['queue_data'][key] = {
-                        'type': 'string',
-                        'data': self.redis_client.get(key)
-                    }
-                elif key_type == 'hash':
-                    queue_data['queue_data'][key] = {
-                        'type': 'hash',
-                        'data': self.redis_client.hgetall(key)
-                    }
-                elif key_type == 'zset':
-                    queue_data['queue_data'][key] = {
-                        'type': 'zset',
-                        'data': self.redis_client.zrange(key, 0, -1, withscores=True)
-                    }
+            for key, data in zip(queue_reads, values):
+                queue_data['queue_data'][key] = {
+                    'type': key_types[key],
+                    'data': data
+                }
             
             # Get patient data
-            for key in patient_keys[:20]:  # Limit to first 20
-                key_type = self.redis_client.type(key)
-                if key_type == 'hash':
-                    patient_data = self.redis_client.hgetall(key)
+            for key, data in zip(patient_reads, values[len(queue_reads):]):
+                if key_types[key] == 'hash':
                     queue_data['patients'].append({
                         'key': key,
-                        'data': patient_data
+                        'data': data
                     })
-                elif key_type == 'string':
+                else:
                     try:
-                        patient_data = json.loads(self.redis_client.get(key))
                         queue_data['patients'].append({
                             'key': key,
-                            'data': patient_data
+                            'data': json.loads(data)
                         })
                     except:
                         pass
@@ -198,87 +223,97 @@ class AgenticWorkflowTester:
             traceback.print_exc()
             return None
     
-    def display_queue_status(self, prefix="", detailed=True):
+    async def display_queue_status(self, prefix="", detailed=True):
         """Display current queue status"""
-        print(f"\n{prefix}{'='*60}")
-        print(f"{prefix}📊 CURRENT QUEUE STATUS (from Redis)")
-        print(f"{prefix}{'='*60}")
-        
-        queue_data = self.get_redis_queue_status()
+        queue_data = await self.get_redis_queue_status()
+        # One write per dump so concurrent test cases don't interleave lines
+        print("\n".join(self.format_queue_status(queue_data, prefix, detailed)))
+    
+    def format_queue_status(self, queue_data, prefix="", detailed=True) -> List[str]:
+        """Build the queue status report as a list of lines"""
+        lines = [
+            f"\n{prefix}{'='*60}",
+            f"{prefix}📊 CURRENT QUEUE STATUS (from Redis)",
+            f"{prefix}{'='*60}",
+        ]
         
         if not queue_data:
-            print(f"{prefix}   ⚠️ Could not retrieve queue data")
-            return
+            lines.append(f"{prefix}   ⚠️ Could not retrieve queue data")
+            return lines
         
         # Show all Redis keys
-        print(f"\n{prefix}🔑 Total Redis Keys: {len(queue_data.get('all_keys', []))}")
+        lines.append(f"\n{prefix}🔑 Total Redis Keys: {queue_data.get('total_keys', 0)}")
         
         # Show categorized keys
         if queue_data.get('queue_keys'):
-            print(f"\n{prefix}📋 Queue Keys ({len(queue_data['queue_keys'])}):")
+            lines.append(f"\n{prefix}📋 Queue Keys ({len(queue_data['queue_keys'])}):")
             for key in queue_data['queue_keys']:
-                print(f"{prefix}   - {key}")
+                lines.append(f"{prefix}   - {key}")
         
         if queue_data.get('brain_keys'):
-            print(f"\n{prefix}🧠 Brain Keys ({len(queue_data['brain_keys'])}):")
+            lines.append(f"\n{prefix}🧠 Brain Keys ({len(queue_data['brain_keys'])}):")
             for key in queue_data['brain_keys']:
-                print(f"{prefix}   - {key}")
+                lines.append(f"{prefix}   - {key}")
         
         if queue_data.get('symptom_keys'):
-            print(f"\n{prefix}🔍 Symptom Keys ({len(queue_data['symptom_keys'])}):")
+            lines.append(f"\n{prefix}🔍 Symptom Keys ({len(queue_data['symptom_keys'])}):")
             for key in queue_data['symptom_keys']:
-                print(f"{prefix}   - {key}")
+                lines.append(f"{prefix}   - {key}")
         
         if queue_data.get('starvation_keys'):
-            print(f"\n{prefix}⏰ Starvation Tracker Keys ({len(queue_data['starvation_keys'])}):")
+            lines.append(f"\n{prefix}⏰ Starvation Tracker Keys ({len(queue_data['starvation_keys'])}):")
             for key in queue_data['starvation_keys']:
-                print(f"{prefix}   - {key}")
+                lines.append(f"{prefix}   - {key}")
         
         # Show patient count
         if queue_data.get('patient_keys'):
-            print(f"\n{prefix}👥 Patient Keys: {len(queue_data['patient_keys'])} patients")
+            lines.append(f"\n{prefix}👥 Patient Keys: {len(queue_data['patient_keys'])} patients")
         
         # Show detailed queue data
         if detailed and queue_data.get('queue_data'):
-            print(f"\n{prefix}📦 Queue Data Details:")
+            lines.append(f"\n{prefix}📦 Queue Data Details:")
             for key, info in list(queue_data['queue_data'].items())[:5]:
-                print(f"\n{prefix}   Key: {key}")
-                print(f"{prefix}   Type: {info['type']}")
+                lines.append(f"\n{prefix}   Key: {key}")
+                lines.append(f"{prefix}   Type: {info['type']}")
                 data = info['data']
                 if isinstance(data, list):
-                    print(f"{prefix}   Count: {len(data)}")
+                    lines.append(f"{prefix}   Count: {len(data)}")
                     for i, item in enumerate(data[:3], 1):
-                        print(f"{prefix}     {i}. {item}")
+                        lines.append(f"{prefix}     {i}. {item}")
                     if len(data) > 3:
-                        print(f"{prefix}     ... and {len(data)-3} more")
+                        lines.append(f"{prefix}     ... and {len(data)-3} more")
                 elif isinstance(data, dict):
-                    print(f"{prefix}   Fields: {len(data)}")
+                    lines.append(f"{prefix}   Fields: {len(data)}")
                     for k, v in list(data.items())[:5]:
-                        print(f"{prefix}     {k}: {v}")
+                        lines.append(f"{prefix}     {k}: {v}")
                     if len(data) > 5:
-                        print(f"{prefix}     ... and {len(data)-5} more fields")
+                        lines.append(f"{prefix}     ... and {len(data)-5} more fields")
                 else:
-                    print(f"{prefix}   Value: {data}")
+                    lines.append(f"{prefix}   Value: {data}")
         
         # Show actual patients in queue
         if queue_data.get('patients'):
-            print(f"\n{prefix}📋 Patients in Queue ({len(queue_data['patients'])}):")
+            lines.append(f"\n{prefix}📋 Patients in Queue ({len(queue_data['patients'])}):")
             for i, patient in enumerate(queue_data['patients'][:10], 1):
-                print(f"\n{prefix}   {i}. {patient['key']}")
+                lines.append(f"\n{prefix}   {i}. {patient['key']}")
                 if patient['data']:
                     data = patient['data']
                     # Show key fields
                     for field in ['patient_name', 'name', 'symptoms', 'urgency_score', 'position', 'status']:
                         if field in data:
-                            print(f"{prefix}      {field}: {data[field]}")
+                            lines.append(f"{prefix}      {field}: {data[field]}")
             if len(queue_data['patients']) > 10:
-                print(f"{prefix}   ... and {len(queue_data['patients'])-10} more patients")
+                lines.append(f"{prefix}   ... and {len(queue_data['patients'])-10} more patients")
+        
+        return lines
     
     async def test_single_case_with_agent(self, test_case: Dict) -> Dict:
         """Test using actual root agent workflow"""
-        print(f"\n{'='*60}")
-        print(f"🧪 Testing with Agent Workflow: {test_case['name']}")
-        print(f"{'='*60}")
+        print("\n".join([
+            f"\n{'='*60}",
+            f"🧪 Testing with Agent Workflow: {test_case['name']}",
+            f"{'='*60}",
+        ]))
         
         result = {
             "test_name": test_case['name'],
@@ -304,8 +339,7 @@ class AgenticWorkflowTester:
             if AGENT_AVAILABLE and hasattr(root_agent, 'process_booking_request'):
                 agent_response = await root_agent.process_booking_request(booking_request)
                 result['steps']['agent_response'] = agent_response
-                print(f"\n✅ Agent Response Received")
-                print(f"   Response: {str(agent_response)[:200]}...")
+                print(f"\n✅ Agent Response Received\n   Response: {str(agent_response)[:200]}...")
             elif AGENT_AVAILABLE:
                 # Try alternative function names
                 for func_name in dir(root_agent):
@@ -315,8 +349,8 @@ class AgenticWorkflowTester:
                             try:
                                 agent_response = await func(booking_request)
                                 result['steps']['agent_response'] = agent_response
-                                print(f"\n✅ Agent Response via {func_name}")
-                                print(f"   Response: {str(agent_response)[:200]}...")
+                                print(f"\n✅ Agent Response via {func_name}\n"
+                                      f"   Response: {str(agent_response)[:200]}...")
                                 break
                             except Exception as e:
                                 print(f"   ⚠️ Could not use {func_name}: {e}")
@@ -326,7 +360,7 @@ class AgenticWorkflowTester:
             
             # Show queue status after agent processing
             print(f"\n📊 Queue Status After Agent Processing:")
-            self.display_queue_status(prefix="   ", detailed=True)
+            await self.display_queue_status(prefix="   ", detailed=True)
             
             result['status'] = 'PASSED'
             print(f"\n✅ Test PASSED: {test_case['name']}")
@@ -335,12 +369,20 @@ class AgenticWorkflowTester:
             result['status'] = 'FAILED'
             result['error'] = str(e)
             import traceback
-            print(f"\n❌ Test FAILED: {test_case['name']}")
-            print(f"   Error: {str(e)}")
-            print(f"   Traceback: {traceback.format_exc()}")
+            print("\n".join([
+                f"\n❌ Test FAILED: {test_case['name']}",
+                f"   Error: {str(e)}",
+                f"   Traceback: {traceback.format_exc()}",
+            ]))
         
         return result
     
+    async def run_test_case(self, index: int, test_case: Dict) -> Dict:
+        """Run one test case once a concurrency slot is free"""
+        async with self._sem:
+            print(f"\n{'#'*60}\n[TEST {index}/{len(TEST_CASES)}]\n{'#'*60}")
+            return await self.test_single_case_with_agent(test_case)
+    
     async def run_all_tests(self):
         """Run all test cases through agent workflow"""
         print("\n" + "="*60)
@@ -348,32 +390,27 @@ class AgenticWorkflowTester:
         print("🤖 Using Actual Agent System with All Sub-Agents")
         print("="*60)
         
+        await self.connect_redis()
+        
         # Show initial queue status
         print("\n🏁 INITIAL QUEUE STATUS:")
-        self.display_queue_status(detailed=True)
+        await self.display_queue_status(detailed=True)
         
-        for i, test_case in enumerate(TEST_CASES, 1):
-            print(f"\n{'#'*60}")
-            print(f"[TEST {i}/{len(TEST_CASES)}]")
-            print(f"{'#'*60}")
-            
-            result = await self.test_single_case_with_agent(test_case)
-            self.results.append(result)
-            
-            # Wait between tests
-            print(f"\n⏳ Waiting 3 seconds before next test...")
-            await asyncio.sleep(3)
+        # Run the independent bookings concurrently, results kept in test order
+        self.results = await asyncio.gather(
+            *(self.run_test_case(i, test_case) for i, test_case in enumerate(TEST_CASES, 1))
+        )
         
         # Show final queue status
         print("\n" + "="*60)
         print("🏁 FINAL QUEUE STATUS AFTER ALL TESTS")
         print("="*60)
-        self.display_queue_status(detailed=True)
+        await self.display_queue_status(detailed=True)
         
         # Generate summary
-        self.generate_summary()
+        await self.generate_summary()
     
-    def generate_summary(self):
+    async def generate_summary(self):
         """Generate test summary report"""
         print("\n" + "="*60)
         print("📊 TEST SUMMARY REPORT")
@@ -382,44 +419,53 @@ class AgenticWorkflowTester:
         passed = sum(1 for r in self.results if r['status'] == 'PASSED')
         failed = sum(1 for r in self.results if r['status'] == 'FAILED')
         
-        print(f"\nTotal Tests: {len(self.results)}")
-        print(f"✅ Passed: {passed}")
-        print(f"❌ Failed: {failed}")
-        print(f"Success Rate: {(passed/len(self.results)*100):.1f}%")
+        print("\n".join([
+            f"\nTotal Tests: {len(self.results)}",
+            f"✅ Passed: {passed}",
+            f"❌ Failed: {failed}",
+            f"Success Rate: {(passed/len(self.results)*100):.1f}%",
+        ]))
         
         # Save results to JSON
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"test_results_agent_{timestamp}.json"
         
+        report = {
+            'summary': {
+                'total': len(self.results),
+                'passed': passed,
+                'failed': failed,
+                'success_rate': f"{(passed/len(self.results)*100):.1f}%",
+                'timestamp': datetime.now().isoformat(),
+                'agent_workflow': True
+            },
+            'results': self.results
+        }
         with open(filename, 'w', encoding='utf-8') as f:
-            json.dump({
-                'summary': {
-                    'total': len(self.results),
-                    'passed': passed,
-                    'failed': failed,
-                    'success_rate': f"{(passed/len(self.results)*100):.1f}%",
-                    'timestamp': datetime.now().isoformat(),
-                    'agent_workflow': True
-                },
-                'results': self.results
-            }, f, indent=2, ensure_ascii=False)
+            f.write(json_dumps(report, indent=True))
         
         print(f"\n📄 Detailed results saved to: {filename}")
         
         # Get final queue statistics
-        final_queue = self.get_redis_queue_status()
+        final_queue = await self.get_redis_queue_status(include_values=False)
         if final_queue:
-            print(f"\n📈 Final Queue Statistics:")
-            print(f"   Total Queue Keys: {len(final_queue.get('queue_keys', []))}")
-            print(f"   Total Patients: {len(final_queue.get('patient_keys', []))}")
-            print(f"   Brain Keys: {len(final_queue.get('brain_keys', []))}")
-            print(f"   Symptom Keys: {len(final_queue.get('symptom_keys', []))}")
-            print(f"   Starvation Keys: {len(final_queue.get('starvation_keys', []))}")
+            print("\n".join([
+                f"\n📈 Final Queue Statistics:",
+                f"   Total Queue Keys: {len(final_queue.get('queue_keys', []))}",
+                f"   Total Patients: {len(final_queue.get('patient_keys', []))}",
+                f"   Brain Keys: {len(final_queue.get('brain_keys', []))}",
+                f"   Symptom Keys: {len(final_queue.get('symptom_keys', []))}",
+                f"   Starvation Keys: {len(final_queue.get('starvation_keys', []))}",
+            ]))
 
 async def main():
     """Main test execution"""
     tester = AgenticWorkflowTester()
-    await tester.run_all_tests()
+    try:
+        await tester.run_all_tests()
+    finally:
+        if tester.redis_client:
+            await tester.redis_client.aclose()
 
 if __name__ == "__main__":
     print("🏥 MediSync Agentic Workflow Test Suite")
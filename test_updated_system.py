@@ -2,19 +2,14 @@
 Test script to verify all updated files use priority_queue_manager correctly
 """
 
-import os
-import sys
-import redis
 from datetime import datetime, timedelta
 
-# Add project root to path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-
 from tools.priority_queue_manager import get_priority_queue_manager
 from tools.eta_tools import calculate_intelligent_etas, predict_optimal_arrival_time
 from tools.orchestrator_brain import execute_intelligent_orchestration, get_orchestration_dashboard
 from tools.notification_agent import send_queue_update_notifications
 from tools.queue_brain import analyze_and_optimize_queue
+from tools.redis_client import get_redis
 
 def test_updated_system():
     """Test all updated components"""
@@ -25,13 +20,7 @@ def test_updated_system():
     
     # Initialize Redis
     try:
-        redis_client = redis.Redis(
-            host=os.getenv("REDIS_HOST", "localhost"),
-            port=int(os.getenv("REDIS_PORT", 6379)),
-            password=os.getenv("REDIS_PASSWORD", None),
-            db=0,
-            decode_responses=True
-        )
+        redis_client = get_redis()
         redis_client.ping()
         print("✅ Connected to Redis")
     except Exception as e:
@@ -43,9 +32,7 @@ def test_updated_system():
     print("✅ Priority Queue Manager initialized")
     
     # Clear and setup test data
-    pq_manager.main_queue.clear()
-    pq_manager.emergency_queue.clear()
-    pq_manager.patient_map.clear()
+    pq_manager.clear()
     pq_manager.global_patient_counter = 0
     print("✅ Queue cleared")
     
@@ -189,7 +176,7 @@ def test_updated_system():
     print("📋 TEST 7: Verify No Old Redis Lists")
     print("-"*70)
     
-    old_queue_len = redis_client.llen("patient_queue")
+    old_queue_len = redis_client.zcard("patient_queue")
     old_emergency_len = redis_client.llen("emergency_queue")
     
     if old_queue_len == 0 and old_emergency_len == 0:
@@ -1,16 +1,25 @@
 """Quick test of urgency-based queue optimization"""
-import redis
-import json
 from tools.queue_brain import analyze_and_optimize_queue
+from tools.json_utils import json_loads
+from tools.redis_client import get_redis
+
+r = get_redis()
+
+
+def print_queue():
+    """Fetch the whole queue in one round trip and print it"""
+    lines = []
+    for i, patient_json in enumerate(r.zrange('patient_queue', 0, -1), 1):
+        patient = json_loads(patient_json)
+        lines.append(f"{i}. Token #{patient['token_number']}: {patient['name']}")
+        lines.append(f"   Urgency: {patient['symptoms_analysis']['urgency_score']}/10")
+    if lines:
+        print("\n".join(lines))
 
-r = redis.Redis(host='localhost', port=6379, decode_responses=True)
 
 print("\n🔍 QUEUE BEFORE OPTIMIZATION:")
 print("=" * 50)
-for i in range(r.llen('patient_queue')):
-    patient = json.loads(r.lindex("patient_queue", i))
-    print(f"{i+1}. Token #{patient['token_number']}: {patient['name']}")
-    print(f"   Urgency: {patient['symptoms_analysis']['urgency_score']}/10")
+print_queue()
 
 print("\n🧠 Calling analyze_and_optimize_queue()...")
 print("=" * 50)
@@ -18,10 +27,7 @@ result = analyze_and_optimize_queue()
 
 print("\n✅ QUEUE AFTER OPTIMIZATION:")
 print("=" * 50)
-for i in range(r.llen('patient_queue')):
-    patient = json.loads(r.lindex("patient_queue", i))
-    print(f"{i+1}. Token #{patient['token_number']}: {patient['name']}")
-    print(f"   Urgency: {patient['symptoms_analysis']['urgency_score']}/10")
+print_queue()
 
 print("\n📊 Optimization Result:")
 print("=" * 50)
@@ -6,7 +6,7 @@ Called by Node.js backend to book appointments through Priority Queue Manager
 
 import sys
 import os
-import json
+import io
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -15,22 +15,27 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 class SuppressDebugOutput:
     def __enter__(self):
         self._original_stdout = sys.stdout
-        sys.stdout = sys.stderr  # Redirect all prints to stderr
+        # Collect prints in memory and hand them to stderr in one write on exit
+        self._buffer = io.StringIO()
+        sys.stdout = self._buffer
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         sys.stdout = self._original_stdout
+        sys.stderr.write(self._buffer.getvalue())
+        sys.stderr.flush()
 
 from tools.clinic_tools_priority_queue import book_intelligent_patient_appointment
+from tools.json_utils import json_dumps, json_loads
 
 def main():
     try:
         # Get appointment data from command line argument
         if len(sys.argv) < 2:
-            print(json.dumps({"error": "No appointment data provided"}))
+            print(json_dumps({"error": "No appointment data provided"}))
             sys.exit(1)
         
-        appointment_data = json.loads(sys.argv[1])
+        appointment_data = json_loads(sys.argv[1])
         
         # Book appointment with suppressed debug output
         with SuppressDebugOutput():
@@ -42,13 +47,13 @@ def main():
             )
         
         # Return result as JSON
-        print(json.dumps({
+        print(json_dumps({
             "success": True,
             "result": result
         }))
         
     except Exception as e:
-        print(json.dumps({
+        print(json_dumps({
             "success": False,
             "error": str(e)
         }))
@@ -6,7 +6,7 @@ Called by Node.js backend to calculate ETAs for all patients
 
 import sys
 import os
-import json
+import io
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -15,13 +15,18 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 class SuppressDebugOutput:
     def __enter__(self):
         self._original_stdout = sys.stdout
-        sys.stdout = sys.stderr  # Redirect all prints to stderr
+        # Collect prints in memory and hand them to stderr in one write on exit
+        self._buffer = io.StringIO()
+        sys.stdout = self._buffer
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
         sys.stdout = self._original_stdout
+        sys.stderr.write(self._buffer.getvalue())
+        sys.stderr.flush()
 
 from tools.eta_tools import calculate_intelligent_etas
+from tools.json_utils import json_dumps
 
 def main():
     try:
@@ -31,7 +36,7 @@ def main():
             result = calculate_intelligent_etas()
         
         # Return ONLY clean JSON to stdout
-        print(json.dumps({
+        print(json_dumps({
             "success": True,
             "etas": result
         }))
@@ -40,7 +45,7 @@ def main():
         # Log error to stderr for debugging
         print(f"[ERROR] ETA calculation failed: {e}", file=sys.stderr)
         # Return error JSON to stdout
-        print(json.dumps({
+        print(json_dumps({
             "success": False,
             "error": str(e)
         }))
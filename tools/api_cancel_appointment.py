@@ -7,7 +7,6 @@ Called by Node.js backend to cancel appointments
 import sys
 import os
 import json
-import redis
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -23,6 +22,7 @@ class SuppressDebugOutput:
         sys.stdout = self._original_stdout
 
 from tools.priority_queue_manager import get_priority_queue_manager
+from tools.redis_client import get_redis
 
 def main():
     try:
@@ -34,11 +34,7 @@ def main():
         token_number = int(sys.argv[1])
         
         # Connect to Redis
-        redis_client = redis.Redis(
-            host='localhost',
-            port=6379,
-            decode_responses=True
-        )
+        redis_client = get_redis()
         
         # Suppress debug output during operations
         with SuppressDebugOutput():
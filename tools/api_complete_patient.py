@@ -8,9 +8,10 @@ import sys
 import json
 import os
 from datetime import datetime
+from pymongo import ReturnDocument
 
-# Add current directory to path for imports
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Suppress all print statements from imported modules
 class SuppressDebugOutput:
@@ -22,7 +23,7 @@ class SuppressDebugOutput:
     def __exit__(self, exc_type, exc_val, exc_tb):
         sys.stdout = self._original_stdout
 
-from mongodb_utils import PatientModel
+from tools.mongodb_utils import PatientModel
 
 def complete_patient(token_number):
     """
@@ -38,51 +39,46 @@ def complete_patient(token_number):
         # Get patient model (MongoDB connection handled internally)
         patient_model = PatientModel()
         
-        # Find patient in MongoDB
-        patient_doc = patient_model.find_by_token(token_number)
-        
-        if not patient_doc:
-            return {
-                "success": False,
-                "error": f"Patient with token #{token_number} not found"
-            }
-        
-        # Check if already completed
-        if patient_doc.get("status") == "COMPLETED":
-            return {
-                "success": False,
-                "error": f"Patient with token #{token_number} is already completed"
-            }
-        
-        # Update patient status in MongoDB
-        result = patient_model.collection.update_one(
-            {"tokenNumber": token_number},
+        # Complete the patient atomically; a patient that is missing or
+        # already completed matches nothing and comes back as None
+        now = datetime.utcnow()
+        patient_doc = patient_model.collection.find_one_and_update(
+            {"tokenNumber": token_number, "status": {"$ne": "COMPLETED"}},
             {
                 "$set": {
                     "status": "COMPLETED",
                     "isActive": False,
-                    "completedAt": datetime.utcnow(),
-                    "lastPriorityUpdate": datetime.utcnow()
+                    "completedAt": now,
+                    "lastPriorityUpdate": now,
+                    "updatedAt": now
                 }
-            }
+            },
+            projection={"_id": 0, "name": 1},
+            return_document=ReturnDocument.AFTER
         )
         
-        if result.modified_count > 0:
-            return {
-                "success": True,
-                "message": f"Patient #{token_number} ({patient_doc['name']}) marked as COMPLETED",
-                "data": {
-                    "token_number": token_number,
-                    "name": patient_doc["name"],
-                    "status": "COMPLETED",
-                    "completed_at": datetime.utcnow().isoformat()
+        if patient_doc is None:
+            # Only the failure path pays for a second lookup to explain itself
+            if patient_model.find_by_token(token_number):
+                return {
+                    "success": False,
+                    "error": f"Patient with token #{token_number} is already completed"
                 }
-            }
-        else:
             return {
                 "success": False,
-                "error": "Failed to update patient status in MongoDB"
+                "error": f"Patient with token #{token_number} not found"
             }
+        
+        return {
+            "success": True,
+            "message": f"Patient #{token_number} ({patient_doc['name']}) marked as COMPLETED",
+            "data": {
+                "token_number": token_number,
+                "name": patient_doc["name"],
+                "status": "COMPLETED",
+                "completed_at": now.isoformat()
+            }
+        }
             
     except Exception as e:
         return {
@@ -90,6 +86,84 @@ def complete_patient(token_number):
             "error": f"Error completing patient: {str(e)}"
         }
 
+def complete_patients_bulk(token_numbers):
+    """
+    Mark several patients as completed with one read and one write
+    
+    Args:
+        token_numbers (list): Patients' token numbers
+        
+    Returns:
+        list: One result per token, shaped like complete_patient()
+    """
+    try:
+        patient_model = PatientModel()
+        
+        # Fetch every requested patient in one round trip
+        patient_docs = {
+            doc["tokenNumber"]: doc
+            for doc in patient_model.collection.find(
+                {"tokenNumber": {"$in": token_numbers}},
+                {"_id": 0, "tokenNumber": 1, "name": 1, "status": 1}
+            )
+        }
+        
+        to_complete = [
+            token for token in dict.fromkeys(token_numbers)
+            if token in patient_docs and patient_docs[token].get("status") != "COMPLETED"
+        ]
+        
+        # Complete them all with a single update
+        now = datetime.utcnow()
+        if to_complete:
+            patient_model.collection.update_many(
+                {"tokenNumber": {"$in": to_complete}, "status": {"$ne": "COMPLETED"}},
+                {
+                    "$set": {
+                        "status": "COMPLETED",
+                        "isActive": False,
+                        "completedAt": now,
+                        "lastPriorityUpdate": now,
+                        "updatedAt": now
+                    }
+                }
+            )
+        
+        results = []
+        completed = set(to_complete)
+        for token_number in token_numbers:
+            patient_doc = patient_docs.get(token_number)
+            if not patient_doc:
+                results.append({
+                    "success": False,
+                    "error": f"Patient with token #{token_number} not found"
+                })
+            elif token_number not in completed:
+                results.append({
+                    "success": False,
+                    "error": f"Patient with token #{token_number} is already completed"
+                })
+            else:
+                # A token listed twice is only completed once
+                completed.discard(token_number)
+                results.append({
+                    "success": True,
+                    "message": f"Patient #{token_number} ({patient_doc['name']}) marked as COMPLETED",
+                    "data": {
+                        "token_number": token_number,
+                        "name": patient_doc["name"],
+                        "status": "COMPLETED",
+                        "completed_at": now.isoformat()
+                    }
+                })
+        return results
+        
+    except Exception as e:
+        return [
+            {"success": False, "error": f"Error completing patient: {str(e)}"}
+            for _ in token_numbers
+        ]
+
 def main():
     try:
         # Get token number from command line argument
@@ -97,6 +171,19 @@ def main():
             print(json.dumps({"success": False, "error": "No token number provided"}))
             sys.exit(1)
         
+        # A JSON array of tokens completes them all in one batch
+        if sys.argv[1].lstrip().startswith("["):
+            token_numbers = [int(token) for token in json.loads(sys.argv[1])]
+            with SuppressDebugOutput():
+                results = complete_patients_bulk(token_numbers)
+            print(json.dumps({
+                "success": all(r.get("success") for r in results),
+                "results": results
+            }, default=str))
+            if not any(r.get("success") for r in results):
+                sys.exit(1)
+            return
+        
         token_number = int(sys.argv[1])
         
         # Complete the patient with suppressed debug output
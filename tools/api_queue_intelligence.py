@@ -7,7 +7,6 @@ Provides intelligent insights and analytics about the queue
 import sys
 import os
 import json
-import redis
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -23,15 +22,12 @@ class SuppressDebugOutput:
         sys.stdout = self._original_stdout
 
 from tools.queue_intelligence import IntelligentQueue
+from tools.redis_client import get_redis
 
 def main():
     try:
         # Connect to Redis
-        redis_client = redis.Redis(
-            host='localhost',
-            port=6379,
-            decode_responses=True
-        )
+        redis_client = get_redis()
         
         # Get queue intelligence with suppressed debug output
         with SuppressDebugOutput():
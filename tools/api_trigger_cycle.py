@@ -7,7 +7,6 @@ Triggers intelligent orchestration cycle after patient completion
 import sys
 import os
 import json
-import redis
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -7,7 +7,6 @@ Called by Node.js backend to update patient location and trigger queue reorderin
 import sys
 import os
 import json
-import redis
 
 # Add parent directory to path for imports
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -34,19 +33,11 @@ def main():
         token_number = int(sys.argv[1])
         location_data = json.loads(sys.argv[2])
         
-        # Connect to Redis
-        redis_client = redis.Redis(
-            host='localhost',
-            port=6379,
-            decode_responses=True
-        )
-        
         # Update patient location with suppressed debug output
         with SuppressDebugOutput():
             result = update_patient_realtime_location(
                 token_number=token_number,
-                new_location=f"{location_data.get('latitude')},{location_data.get('longitude')}",
-                redis_client=redis_client
+                new_location=f"{location_data.get('latitude')},{location_data.get('longitude')}"
             )
         
         # Return result as JSON
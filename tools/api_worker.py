@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+API Worker: Long-lived Python process for the Node.js backend
+Imports the tools once and serves requests as JSON lines over stdin/stdout,
+so each call skips interpreter start-up and reuses the Redis/MongoDB
+connections and the Priority Queue Manager already held by this process.
+
+Request:  {"id": 1, "method": "book_appointment", "params": {...}}
+Response: {"id": 1, "success": true, "result": ...}
+
+Booking and completion requests that arrive within BATCH_WINDOW_SECS of
+each other are handled together: bookings share one token reservation,
+one MongoDB insert and one queue snapshot; completions share one read
+and one update.
+"""
+
+import sys
+import os
+import io
+import queue
+import threading
+import time
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Responses go to the real stdout; every print from the tools goes to stderr
+_response_stream = sys.stdout
+sys.stdout = sys.stderr
+
+from tools.clinic_tools_priority_queue import (
+    book_intelligent_patient_appointments,
+    update_patient_realtime_location,
+    pq_manager,
+)
+from tools.eta_tools import calculate_intelligent_etas
+from tools.free_maps import get_free_maps_service, get_real_clinic_location
+from tools.notification_agent import send_queue_update_notifications
+from tools.orchestrator_brain import execute_intelligent_orchestration
+from tools.queue_intelligence import IntelligentQueue
+from tools.redis_client import get_redis
+from tools.api_complete_patient import complete_patients_bulk
+from tools.json_utils import json_dumps, json_loads
+
+intelligent_queue = IntelligentQueue(get_redis())
+
+
+# How long to wait for more requests once one has arrived
+BATCH_WINDOW_SECS = 0.002
+MAX_BATCH_SIZE = 64
+
+# Check MongoDB for queue changes made by other processes at most this often
+SYNC_INTERVAL_SECS = 1.0
+_last_sync = 0.0
+
+
+def calculate_etas(params: dict) -> dict:
+    """Same payload as api_calculate_etas.py"""
+    return {"etas": calculate_intelligent_etas()}
+
+
+def cancel_appointment(params: dict) -> dict:
+    """Same payload as api_cancel_appointment.py"""
+    token_number = int(params['token_number'])
+    if not pq_manager.remove_patient(token_number):
+        raise ValueError(f"Patient #{token_number} not found in queue")
+    return {"message": f"Appointment #{token_number} canceled successfully"}
+
+
+def update_location(params: dict) -> dict:
+    """Same payload as api_update_location.py"""
+    location = params.get('location') or {}
+    result = update_patient_realtime_location(
+        token_number=int(params['token_number']),
+        new_location=f"{location.get('latitude')},{location.get('longitude')}"
+    )
+    return {"result": result}
+
+
+def queue_intelligence(params: dict) -> dict:
+    """Same payload as api_queue_intelligence.py"""
+    return {"intelligence": intelligent_queue.optimize_queue_order()}
+
+
+def send_notifications(params: dict) -> dict:
+    """Same payload as api_send_notifications.py"""
+    result = send_queue_update_notifications()
+    return {
+        "message": "Notifications sent successfully",
+        "data": result if isinstance(result, dict) else {"message": result}
+    }
+
+
+def trigger_cycle(params: dict) -> dict:
+    """Same payload as api_trigger_cycle.py"""
+    result = execute_intelligent_orchestration()
+    return {
+        "message": "Orchestration cycle triggered successfully",
+        "data": result if isinstance(result, dict) else {"message": result}
+    }
+
+
+HANDLERS = {
+    "calculate_etas": calculate_etas,
+    "cancel_appointment": cancel_appointment,
+    "update_location": update_location,
+    "queue_intelligence": queue_intelligence,
+    "send_notifications": send_notifications,
+    "trigger_cycle": trigger_cycle,
+}
+
+
+def error_response(request_id, error: Exception) -> dict:
+    """Log a failed request and build its error response"""
+    print(f"[ERROR] Worker request failed: {error}", file=sys.stderr)
+    return {"id": request_id, "success": False, "error": str(error)}
+
+
+def book_appointments(requests: list) -> list:
+    """Book a batch of book_appointment requests; each fails or succeeds on its own"""
+    try:
+        results = book_intelligent_patient_appointments(
+            [request.get('params') or {} for request in requests]
+        )
+    except Exception as e:
+        # Only the shared steps (token reservation, MongoDB insert) get here;
+        # retrying could book patients twice, so the whole batch fails
+        return [error_response(request.get('id'), e) for request in requests]
+    
+    responses = []
+    for request, result in zip(requests, results):
+        if isinstance(result, Exception):
+            responses.append(error_response(request.get('id'), result))
+        else:
+            responses.append({"id": request.get('id'), "success": True, "result": result})
+    return responses
+
+
+def complete_patients(requests: list) -> list:
+    """Complete a batch of complete_patient requests with one bulk update"""
+    try:
+        token_numbers = [int((request.get('params') or {})['token_number']) for request in requests]
+    except (KeyError, TypeError, ValueError) as e:
+        # Fall back to one call per request so only the malformed ones fail
+        if len(requests) > 1:
+            return [response for request in requests for response in complete_patients([request])]
+        return [error_response(requests[0].get('id'), e)]
+    
+    results = complete_patients_bulk(token_numbers)
+    
+    # Completed patients leave this process's queue too; MongoDB already
+    # has them as COMPLETED, so they must not be marked cancelled
+    pq_manager.remove_patients(
+        [token_number for token_number, result in zip(token_numbers, results) if result.get("success")],
+        mark_cancelled=False,
+    )
+    
+    responses = []
+    for request, result in zip(requests, results):
+        if result.get("success"):
+            responses.append({"id": request.get('id'), **result})
+        else:
+            responses.append(error_response(request.get('id'), ValueError(result.get("error"))))
+    return responses
+
+
+# Requests of these methods in one batch window are handled by a single call
+BATCH_HANDLERS = {
+    "book_appointment": book_appointments,
+    "complete_patient": complete_patients,
+}
+
+
+def handle_request(request: dict) -> dict:
+    """Dispatch one non-booking request and build its response"""
+    request_id = request.get('id')
+    try:
+        handler = HANDLERS.get(request.get('method'))
+        if handler is None:
+            raise ValueError(f"Unknown method: {request.get('method')}")
+        response = {"id": request_id, "success": True}
+        response.update(handler(request.get('params') or {}))
+        return response
+    except Exception as e:
+        return error_response(request_id, e)
+
+
+def sync_queue():
+    """Pick up cancellations, completions and bookings made outside this worker"""
+    global _last_sync
+    now = time.monotonic()
+    if now - _last_sync < SYNC_INTERVAL_SECS:
+        return
+    _last_sync = now
+    try:
+        pq_manager.sync_from_mongodb()
+    except Exception as e:
+        print(f"[WARNING] Queue sync from MongoDB failed: {e}", file=sys.stderr)
+
+
+def handle_batch(lines: list) -> list:
+    """Parse a batch of request lines, group the batchable methods, run the rest in order"""
+    sync_queue()
+    
+    responses = []
+    grouped = {method: [] for method in BATCH_HANDLERS}
+    for line in lines:
+        try:
+            request = json_loads(line)
+        except ValueError as e:
+            responses.append(error_response(None, e))
+            continue
+        if request.get('method') in grouped:
+            grouped[request['method']].append(request)
+        else:
+            responses.append(handle_request(request))
+    for method, requests in grouped.items():
+        if requests:
+            responses.extend(BATCH_HANDLERS[method](requests))
+    return responses
+
+
+def warm_up():
+    """Do the lazy first-request work at start-up instead of inside a request"""
+    try:
+        # Every booking routes to the clinic, so resolve its coordinates once now
+        get_free_maps_service().geocode_address(get_real_clinic_location())
+        # Prime the cached queue snapshot used for positions and ETAs
+        pq_manager.get_queue_snapshot()
+    except Exception as e:
+        print(f"[WARNING] Worker warm-up incomplete: {e}", file=sys.stderr)
+
+
+def read_requests(pending: queue.Queue):
+    """Feed stdin lines into the queue; None marks end of input"""
+    for line in sys.stdin:
+        if line.strip():
+            pending.put(line)
+    pending.put(None)
+
+
+def main():
+    pending = queue.Queue()
+    threading.Thread(target=read_requests, args=(pending,), daemon=True).start()
+    warm_up()
+    print("[OK] API worker ready", file=sys.stderr)
+    
+    done = False
+    while not done:
+        # Block for the first request, then gather whatever arrives within the window
+        lines = [pending.get()]
+        while lines[-1] is not None and len(lines) < MAX_BATCH_SIZE:
+            try:
+                lines.append(pending.get(timeout=BATCH_WINDOW_SECS))
+            except queue.Empty:
+                break
+        if lines[-1] is None:
+            lines.pop()
+            done = True
+        
+        # Tool prints for the batch are collected and reach stderr in one write
+        log_buffer = io.StringIO()
+        sys.stdout = log_buffer
+        try:
+            responses = handle_batch(lines)
+        finally:
+            sys.stdout = sys.stderr
+            sys.stderr.write(log_buffer.getvalue())
+            sys.stderr.flush()
+        
+        if responses:
+            _response_stream.write("".join(json_dumps(r) + "\n" for r in responses))
+            _response_stream.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,32 +3,35 @@ A* Pathfinding Algorithm for Real-Time Travel ETA
 Integrates with OpenStreetMap for road network and traffic data.
 
 Data Structure:
-- Adjacency List Graph (road network)
-- Priority Queue for A* frontier
+- Adjacency List Graph (road network), stored as per-node-id columns
+- Priority Queue for A* frontier, with flat per-node score arrays
 
 Algorithm:
-- A* search with Haversine heuristic
+- Precomputed all-pairs shortest paths (Floyd-Warshall) for small graphs
+- A* search with Haversine heuristic for larger ones
 - Real-time traffic weight adjustments
 """
 
 import heapq
 import math
-from typing import Dict, List, Tuple, Optional, Set
-from dataclasses import dataclass, field
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Tuple, Optional
 from datetime import datetime
 from tools.free_maps import FreeMapsService
 
+EARTH_DIAMETER_KM = 2 * 6371  # Twice the Earth radius in km
+DEG_TO_RAD = math.pi / 180
 
-@dataclass(order=True)
-class AStarNode:
-    """Node for A* search priority queue"""
-    f_score: float  # g + h (total cost estimate)
-    g_score: float = field(compare=False)  # Cost from start
-    h_score: float = field(compare=False)  # Heuristic to goal
-    lat: float = field(compare=False)
-    lon: float = field(compare=False)
-    parent: Optional[Tuple[float, float]] = field(compare=False, default=None)
+# Graphs up to this size answer ETAs from a precomputed all-pairs table
+SHORTEST_PATH_TABLE_MAX_NODES = 64
 
+# How long a looked-up traffic multiplier is reused (never past the hour)
+TRAFFIC_MULTIPLIER_TTL_SECS = 60
+
+# Recent ETAs kept, keyed by coordinates rounded to 3 decimals (~110 m)
+ETA_CACHE_SIZE = 4096
+ETA_CACHE_PRECISION = 3
 
 class RoadNetworkGraph:
     """
@@ -37,8 +40,18 @@ class RoadNetworkGraph:
     """
     
     def __init__(self):
-        # Adjacency list: (lat, lon) -> [(neighbor_lat, neighbor_lon, weight_mins)]
-        self.graph: Dict[Tuple[float, float], List[Tuple[float, float, float]]] = {}
+        # Nodes are numbered in insertion order; (lat, lon) -> node id
+        self.node_ids: Dict[Tuple[float, float], int] = {}
+        self.node_lat: List[float] = []
+        self.node_lon: List[float] = []
+        
+        # Adjacency list by node id, kept as parallel columns:
+        # neighbor_ids[n][i] is reached from n in neighbor_weights[n][i] mins
+        self.neighbor_ids: List[List[int]] = []
+        self.neighbor_weights: List[List[float]] = []
+        
+        # All-pairs (base times, next hops), built on first use after an edit
+        self._shortest_paths: Optional[Tuple[List[List[float]], List[List[int]]]] = None
         
         # Traffic multipliers by time of day
         self.traffic_patterns = {
@@ -47,36 +60,102 @@ class RoadNetworkGraph:
             "lunch": (12, 14, 1.3),          # 12-2 PM, 1.3x slower
             "night": (22, 6, 0.8),           # 10 PM-6 AM, 0.8x (faster)
         }
+        self._hour_multipliers = self._build_hour_multipliers()
+    
+    def _add_node(self, lat: float, lon: float) -> int:
+        """Get the id of a node, adding it if new"""
+        node_id = self.node_ids.get((lat, lon))
+        if node_id is None:
+            node_id = len(self.node_lat)
+            self.node_ids[(lat, lon)] = node_id
+            self.node_lat.append(lat)
+            self.node_lon.append(lon)
+            self.neighbor_ids.append([])
+            self.neighbor_weights.append([])
+        return node_id
     
     def add_edge(self, from_lat: float, from_lon: float, 
                  to_lat: float, to_lon: float, base_time_mins: float):
         """Add bidirectional road edge"""
-        from_node = (from_lat, from_lon)
-        to_node = (to_lat, to_lon)
+        from_id = self._add_node(from_lat, from_lon)
+        to_id = self._add_node(to_lat, to_lon)
         
-        if from_node not in self.graph:
-            self.graph[from_node] = []
-        if to_node not in self.graph:
-            self.graph[to_node] = []
+        self.neighbor_ids[from_id].append(to_id)
+        self.neighbor_weights[from_id].append(base_time_mins)
+        self.neighbor_ids[to_id].append(from_id)
+        self.neighbor_weights[to_id].append(base_time_mins)
+        self._shortest_paths = None
+    
+    def get_neighbors_id(self, node_id: int) -> Tuple[List[int], List[float]]:
+        """Get neighbor ids and edge weights of a node id"""
+        return self.neighbor_ids[node_id], self.neighbor_weights[node_id]
+    
+    def shortest_paths(self) -> Tuple[List[List[float]], List[List[int]]]:
+        """
+        All-pairs shortest base travel times (Floyd-Warshall).
         
-        self.graph[from_node].append((to_lat, to_lon, base_time_mins))
-        self.graph[to_node].append((from_lat, from_lon, base_time_mins))
+        Returns:
+            (times, next_hop): times[i][j] is the fastest base time in mins
+            from node i to node j (inf if unreachable), and next_hop[i][j]
+            is the node to move to from i on that route
+        """
+        if self._shortest_paths is None:
+            node_count = len(self.node_lat)
+            times = [[math.inf] * node_count for _ in range(node_count)]
+            next_hop = [[-1] * node_count for _ in range(node_count)]
+            
+            for i in range(node_count):
+                times[i][i] = 0
+                next_hop[i][i] = i
+                for j, weight in zip(self.neighbor_ids[i], self.neighbor_weights[i]):
+                    if weight < times[i][j]:
+                        times[i][j] = weight
+                        next_hop[i][j] = j
+            
+            for k in range(node_count):
+                times_k = times[k]
+                for i in range(node_count):
+                    time_ik = times[i][k]
+                    if time_ik == math.inf:
+                        continue
+                    times_i = times[i]
+                    hops_i = next_hop[i]
+                    hop_ik = hops_i[k]
+                    for j in range(node_count):
+                        if time_ik + times_k[j] < times_i[j]:
+                            times_i[j] = time_ik + times_k[j]
+                            hops_i[j] = hop_ik
+            
+            self._shortest_paths = (times, next_hop)
+        return self._shortest_paths
     
     def get_neighbors(self, lat: float, lon: float) -> List[Tuple[float, float, float]]:
         """Get neighboring nodes with edge weights"""
-        node = (lat, lon)
-        return self.graph.get(node, [])
+        node_id = self.node_ids.get((lat, lon))
+        if node_id is None:
+            return []
+        return [
+            (self.node_lat[neighbor_id], self.node_lon[neighbor_id], weight)
+            for neighbor_id, weight in zip(*self.get_neighbors_id(node_id))
+        ]
+    
+    def _build_hour_multipliers(self) -> List[float]:
+        """Resolve traffic_patterns into one multiplier per hour of the day"""
+        hour_multipliers = [1.0] * 24  # Normal traffic
+        # Earlier patterns take precedence, so apply them last
+        for start, end, multiplier in reversed(list(self.traffic_patterns.values())):
+            for hour in range(24):
+                if start <= end:
+                    if start <= hour < end:
+                        hour_multipliers[hour] = multiplier
+                else:  # Wraps around midnight
+                    if hour >= start or hour < end:
+                        hour_multipliers[hour] = multiplier
+        return hour_multipliers
     
     def get_traffic_multiplier(self, current_hour: int) -> float:
         """Get current traffic multiplier based on time"""
-        for pattern, (start, end, multiplier) in self.traffic_patterns.items():
-            if start <= end:
-                if start <= current_hour < end:
-                    return multiplier
-            else:  # Wraps around midnight
-                if current_hour >= start or current_hour < end:
-                    return multiplier
-        return 1.0  # Normal traffic
+        return self._hour_multipliers[current_hour]
 
 
 class AStarETACalculator:
@@ -93,8 +172,15 @@ class AStarETACalculator:
         self.road_network = RoadNetworkGraph()
         self.maps_service = maps_service or FreeMapsService()
         
+        # (monotonic expiry, multiplier) for the current hour's traffic
+        self._traffic_cache: Tuple[float, float] = (0.0, 1.0)
+        
+        # Least recently used ETAs first
+        self._eta_cache: "OrderedDict[Tuple[float, ...], Dict]" = OrderedDict()
+        
         # Initialize with Mumbai key locations (simplified demo)
         self._init_mumbai_graph()
+        self.road_network.shortest_paths()
         
         print("[OK] A* ETA Calculator initialized with road network")
     
@@ -135,19 +221,33 @@ class AStarETACalculator:
         Calculate great-circle distance between two points (km).
         Used as A* heuristic.
         """
-        R = 6371  # Earth radius in km
-        
-        lat1_rad = math.radians(lat1)
-        lat2_rad = math.radians(lat2)
-        delta_lat = math.radians(lat2 - lat1)
-        delta_lon = math.radians(lon2 - lon1)
+        lat1_rad = lat1 * DEG_TO_RAD
+        lat2_rad = lat2 * DEG_TO_RAD
         
-        a = (math.sin(delta_lat / 2) ** 2 +
+        a = (math.sin((lat2_rad - lat1_rad) * 0.5) ** 2 +
              math.cos(lat1_rad) * math.cos(lat2_rad) *
-             math.sin(delta_lon / 2) ** 2)
+             math.sin((lon2 - lon1) * DEG_TO_RAD * 0.5) ** 2)
         
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        distance = R * c
+        return EARTH_DIAMETER_KM * math.asin(math.sqrt(a))
+    
+    @staticmethod
+    def haversine_to_goal(goal_lat: float, goal_lon: float) -> Callable[[float, float], float]:
+        """
+        Build a distance function to a fixed goal (km).
+        The goal's radians and cosine are computed once, so each A*
+        expansion only pays for the point's own trig.
+        """
+        goal_lat_rad = goal_lat * DEG_TO_RAD
+        goal_lon_rad = goal_lon * DEG_TO_RAD
+        cos_goal_lat = math.cos(goal_lat_rad)
+        sin, cos, asin, sqrt = math.sin, math.cos, math.asin, math.sqrt
+        
+        def distance(lat: float, lon: float) -> float:
+            lat_rad = lat * DEG_TO_RAD
+            a = (sin((goal_lat_rad - lat_rad) * 0.5) ** 2 +
+                 cos(lat_rad) * cos_goal_lat *
+                 sin((goal_lon_rad - lon * DEG_TO_RAD) * 0.5) ** 2)
+            return EARTH_DIAMETER_KM * asin(sqrt(a))
         
         return distance
     
@@ -163,7 +263,8 @@ class AStarETACalculator:
     def calculate_eta(self, from_lat: float, from_lon: float,
                      to_lat: float, to_lon: float) -> Dict:
         """
-        Calculate travel ETA using A* algorithm with real-time traffic.
+        Calculate travel ETA over the road graph with real-time traffic.
+        Small graphs use the precomputed shortest-path table, larger ones A*.
         Falls back to free_maps API if graph path not found.
         
         Args:
@@ -173,10 +274,36 @@ class AStarETACalculator:
         Returns:
             Dict with travel_time_mins, distance_km, path, method
         """
+        # Nearby points under the same traffic share one ETA
+        cache_key = (
+            round(from_lat, ETA_CACHE_PRECISION), round(from_lon, ETA_CACHE_PRECISION),
+            round(to_lat, ETA_CACHE_PRECISION), round(to_lon, ETA_CACHE_PRECISION),
+            self._current_traffic_multiplier(),
+        )
+        cached = self._eta_cache.pop(cache_key, None)
+        if cached is not None:
+            self._eta_cache[cache_key] = cached
+            return dict(cached)
+        
+        result = self._calculate_eta_uncached(from_lat, from_lon, to_lat, to_lon)
+        
+        # A straight-line estimate means the maps API failed; retry it next time
+        if result.get("method") != "haversine_estimate":
+            self._eta_cache[cache_key] = result
+            if len(self._eta_cache) > ETA_CACHE_SIZE:
+                self._eta_cache.popitem(last=False)
+        return dict(result)
+    
+    def _calculate_eta_uncached(self, from_lat: float, from_lon: float,
+                                to_lat: float, to_lon: float) -> Dict:
+        """Route over the graph, falling back to the free_maps API"""
         print(f"[INFO] [A* ETA] Calculating route: ({from_lat}, {from_lon}) → ({to_lat}, {to_lon})")
         
-        # Try A* on local graph first
-        result = self._astar_search(from_lat, from_lon, to_lat, to_lon)
+        # Try the local graph first
+        if len(self.road_network.node_lat) <= SHORTEST_PATH_TABLE_MAX_NODES:
+            result = self._lookup_shortest_path(from_lat, from_lon, to_lat, to_lon)
+        else:
+            result = self._astar_search(from_lat, from_lon, to_lat, to_lon)
         
         if result["path_found"]:
             print(f"[OK] [A* ETA] Route found: {result['travel_time_mins']:.1f} mins via graph")
@@ -186,6 +313,58 @@ class AStarETACalculator:
         print(f"[CYCLE] [A* ETA] Graph incomplete, using free_maps API fallback")
         return self._fallback_to_api(from_lat, from_lon, to_lat, to_lon)
     
+    def _current_traffic_multiplier(self) -> float:
+        """Traffic multiplier for the current hour, re-read at most once a minute"""
+        now = time.monotonic()
+        expires_at, multiplier = self._traffic_cache
+        if now >= expires_at:
+            current = datetime.now()
+            secs_left_in_hour = 3600 - (current.minute * 60 + current.second)
+            multiplier = self.road_network.get_traffic_multiplier(current.hour)
+            self._traffic_cache = (now + min(TRAFFIC_MULTIPLIER_TTL_SECS, secs_left_in_hour), multiplier)
+        return multiplier
+    
+    def _lookup_shortest_path(self, start_lat: float, start_lon: float,
+                              goal_lat: float, goal_lon: float) -> Dict:
+        """
+        Answer a route from the all-pairs table instead of searching.
+        The goal is reached at the graph node nearest to it, if within 500m.
+        
+        Returns:
+            Dict with path_found, travel_time_mins, distance_km, path
+        """
+        network = self.road_network
+        
+        start_id = network.node_ids.get((start_lat, start_lon))
+        if start_id is None:
+            return {"path_found": False}
+        
+        # Snap the goal to its nearest node
+        distance_to_goal = self.haversine_to_goal(goal_lat, goal_lon)
+        goal_distance, goal_id = min(
+            (distance_to_goal(lat, lon), node_id)
+            for node_id, (lat, lon) in enumerate(zip(network.node_lat, network.node_lon))
+        )
+        
+        times, next_hop = network.shortest_paths()
+        if goal_distance >= 0.5 or times[start_id][goal_id] == math.inf:  # <500m
+            return {"path_found": False}
+        
+        path_ids = [start_id]
+        while path_ids[-1] != goal_id:
+            path_ids.append(next_hop[path_ids[-1]][goal_id])
+        
+        traffic_multiplier = self._current_traffic_multiplier()
+        
+        return {
+            "path_found": True,
+            "travel_time_mins": times[start_id][goal_id] * traffic_multiplier,
+            "distance_km": distance_to_goal(start_lat, start_lon),
+            "path": [(network.node_lat[node_id], network.node_lon[node_id]) for node_id in path_ids],
+            "method": "astar_graph",
+            "traffic_multiplier": traffic_multiplier,
+        }
+    
     def _astar_search(self, start_lat: float, start_lon: float,
                      goal_lat: float, goal_lon: float) -> Dict:
         """
@@ -194,37 +373,39 @@ class AStarETACalculator:
         Returns:
             Dict with path_found, travel_time_mins, distance_km, path
         """
-        start = (start_lat, start_lon)
-        goal = (goal_lat, goal_lon)
+        network = self.road_network
         
-        # Check if nodes exist in graph (simplified check)
-        if start not in self.road_network.graph and goal not in self.road_network.graph:
+        # The search runs on node ids; a start off the graph has nowhere to go
+        start_id = network.node_ids.get((start_lat, start_lon))
+        if start_id is None:
             return {"path_found": False}
         
         # Get current traffic multiplier
-        current_hour = datetime.now().hour
-        traffic_multiplier = self.road_network.get_traffic_multiplier(current_hour)
+        traffic_multiplier = self._current_traffic_multiplier()
         
-        # A* data structures
-        frontier = []  # Priority queue
-        visited: Set[Tuple[float, float]] = set()
-        g_scores: Dict[Tuple[float, float], float] = {start: 0}
-        came_from: Dict[Tuple[float, float], Optional[Tuple[float, float]]] = {start: None}
+        # A* data structures, indexed by node id
+        node_count = len(network.node_lat)
+        frontier: List[Tuple[float, float, int]] = []  # Priority queue of (f, g, node_id)
+        visited = [False] * node_count
+        g_scores = [math.inf] * node_count
+        came_from = [-1] * node_count  # -1 marks the start of the path
+        g_scores[start_id] = 0
         
-        # Initial heuristic
-        h_start = self.distance_to_time_heuristic(
-            self.haversine_distance(start_lat, start_lon, goal_lat, goal_lon)
-        )
+        # Distance to the goal is needed for every goal check and heuristic;
+        # it is computed once per node, when the node is first pushed
+        distance_to_goal = self.haversine_to_goal(goal_lat, goal_lon)
+        goal_km = [-1.0] * node_count
+        goal_km[start_id] = distance_to_goal(start_lat, start_lon)
         
-        start_node = AStarNode(
-            f_score=h_start,
-            g_score=0,
-            h_score=h_start,
-            lat=start_lat,
-            lon=start_lon,
-        )
+        # Hot-loop locals
+        node_lat, node_lon = network.node_lat, network.node_lon
+        neighbor_ids, neighbor_weights = network.neighbor_ids, network.neighbor_weights
+        heappush, heappop = heapq.heappush, heapq.heappop
+        
+        # Initial heuristic
+        h_start = self.distance_to_time_heuristic(goal_km[start_id])
         
-        heapq.heappush(frontier, start_node)
+        heappush(frontier, (h_start, 0, start_id))
         
         # A* main loop
         iterations = 0
@@ -233,18 +414,17 @@ class AStarETACalculator:
         while frontier and iterations < max_iterations:
             iterations += 1
             
-            current = heapq.heappop(frontier)
-            current_node = (current.lat, current.lon)
+            _, current_g, current_id = heappop(frontier)
             
             # Goal check
-            if self.haversine_distance(current.lat, current.lon, goal_lat, goal_lon) < 0.5:  # <500m
+            if goal_km[current_id] < 0.5:  # <500m
                 # Reconstruct path
-                path = self._reconstruct_path(came_from, current_node)
-                total_distance = self.haversine_distance(start_lat, start_lon, goal_lat, goal_lon)
+                path = self._reconstruct_path(came_from, current_id)
+                total_distance = goal_km[start_id]
                 
                 return {
                     "path_found": True,
-                    "travel_time_mins": current.g_score,
+                    "travel_time_mins": current_g,
                     "distance_km": total_distance,
                     "path": path,
                     "method": "astar_graph",
@@ -252,54 +432,41 @@ class AStarETACalculator:
                     "iterations": iterations,
                 }
             
-            if current_node in visited:
+            if visited[current_id]:
                 continue
             
-            visited.add(current_node)
+            visited[current_id] = True
             
             # Expand neighbors
-            for neighbor_lat, neighbor_lon, base_time in self.road_network.get_neighbors(current.lat, current.lon):
-                neighbor = (neighbor_lat, neighbor_lon)
-                
-                if neighbor in visited:
+            for neighbor_id, base_time in zip(neighbor_ids[current_id], neighbor_weights[current_id]):
+                if visited[neighbor_id]:
                     continue
                 
                 # Calculate g_score with traffic
-                edge_cost = base_time * traffic_multiplier
-                tentative_g = current.g_score + edge_cost
+                tentative_g = current_g + base_time * traffic_multiplier
                 
-                if neighbor not in g_scores or tentative_g < g_scores[neighbor]:
-                    g_scores[neighbor] = tentative_g
-                    came_from[neighbor] = current_node
+                if tentative_g < g_scores[neighbor_id]:
+                    g_scores[neighbor_id] = tentative_g
+                    came_from[neighbor_id] = current_id
                     
                     # Heuristic: distance to goal
-                    h_score = self.distance_to_time_heuristic(
-                        self.haversine_distance(neighbor_lat, neighbor_lon, goal_lat, goal_lon)
-                    )
-                    
-                    f_score = tentative_g + h_score
-                    
-                    neighbor_node = AStarNode(
-                        f_score=f_score,
-                        g_score=tentative_g,
-                        h_score=h_score,
-                        lat=neighbor_lat,
-                        lon=neighbor_lon,
-                    )
+                    if goal_km[neighbor_id] < 0:
+                        goal_km[neighbor_id] = distance_to_goal(node_lat[neighbor_id], node_lon[neighbor_id])
+                    h_score = self.distance_to_time_heuristic(goal_km[neighbor_id])
                     
-                    heapq.heappush(frontier, neighbor_node)
+                    heappush(frontier, (tentative_g + h_score, tentative_g, neighbor_id))
         
         # No path found
         return {"path_found": False}
     
-    def _reconstruct_path(self, came_from: Dict, current: Tuple[float, float]) -> List[Tuple[float, float]]:
-        """Reconstruct path from came_from chain"""
+    def _reconstruct_path(self, came_from: List[int], current: int) -> List[Tuple[float, float]]:
+        """Reconstruct (lat, lon) path from came_from chain of node ids"""
         path = [current]
-        while current in came_from and came_from[current] is not None:
+        while came_from[current] >= 0:
             current = came_from[current]
             path.append(current)
         path.reverse()
-        return path
+        return [(self.road_network.node_lat[node_id], self.road_network.node_lon[node_id]) for node_id in path]
     
     def _fallback_to_api(self, from_lat: float, from_lon: float,
                         to_lat: float, to_lon: float) -> Dict:
@@ -336,7 +503,9 @@ class AStarETACalculator:
     def update_traffic_conditions(self, hour: int, multiplier: float):
         """Update traffic patterns dynamically"""
         # Could be extended to learn from historical data
-        pass
+        # Anything cached was computed under the old traffic
+        self._traffic_cache = (0.0, 1.0)
+        self._eta_cache.clear()
 
 
 # Global singleton
@@ -6,16 +6,11 @@ from typing import Dict, List, Optional
 
 # Import Priority Queue Manager
 from tools.priority_queue_manager import get_priority_queue_manager
+from tools.redis_client import get_redis
 
 # Redis connection
 try:
-    redis_client = redis.Redis(
-        host=os.getenv("REDIS_HOST", "localhost"),
-        port=int(os.getenv("REDIS_PORT", 6379)),
-        password=os.getenv("REDIS_PASSWORD", None),
-        db=0,
-        decode_responses=True,
-    )
+    redis_client = get_redis()
     redis_client.ping()
     print("[OK] Clinic Monitor: Successfully connected to Redis.")
 except redis.exceptions.ConnectionError as e:
@@ -99,8 +94,11 @@ def mark_patient_completed(patient_token: int) -> str:
         "optimization_trigger": True
     }
     
-    redis_client.set("last_completed_patient", json.dumps(completion_data))
-    redis_client.delete("ongoing_patient_status")  # Clear ongoing status
+    # Publish completion and clear ongoing status atomically in one round-trip
+    pipe = redis_client.pipeline(transaction=True)
+    pipe.set("last_completed_patient", json.dumps(completion_data))
+    pipe.delete("ongoing_patient_status")
+    pipe.execute()
     
     # Get next patient in line
     next_patient = _get_next_patient_in_queue()
@@ -266,13 +264,8 @@ def _remove_patient_from_queues(patient_token: int) -> bool:
             print("[ERROR] Priority Queue Manager not initialized")
             return False
 
-        # Check if patient exists in the queue
-        patient = pq_manager.patient_map.get(patient_token)
-        if not patient:
-            print(f"[ERROR] Patient with token {patient_token} not found in queue")
-            return False
-
         # Remove patient from priority queue by token
+        # (remove_patient checks the O(1) patient_map and reports unknown tokens)
         removed = pq_manager.remove_patient(patient_token)
         if removed:
             print(f"[OK] Successfully removed patient {patient_token} from priority queue")
@@ -1,5 +1,6 @@
 import os
 import json
+import time
 import redis
 from datetime import datetime, timedelta
 
@@ -9,21 +10,94 @@ from tools.free_maps import (
     get_real_clinic_location,
 )
 from tools.symptom_analyzer import analyze_patient_symptoms
+from tools.redis_client import get_redis
 
 # --- END CORRECTIONS ---
 
 
+# patient_queue is a sorted set scored by urgency, then booking time.
+# The urgency step exceeds any epoch-millisecond value, so a higher urgency
+# always sorts first and equal urgencies stay FIFO. Scores stay well inside
+# the 2**53 range doubles represent exactly.
+PATIENT_QUEUE_URGENCY_STEP = 10**13
+
+
+def patient_queue_score(urgency_score: float, booked_at: float = None) -> float:
+    """
+    Compute the patient_queue ZSET score for a booking.
+
+    Args:
+        urgency_score: Urgency on the 1-10 scale (higher is served first)
+        booked_at: Booking time as a Unix timestamp (defaults to now)
+
+    Returns:
+        Score where ascending order is service order
+    """
+    booked_ms = int((booked_at if booked_at is not None else time.time()) * 1000)
+    return -urgency_score * PATIENT_QUEUE_URGENCY_STEP + booked_ms
+
+
+def patient_queue_urgency(score: float) -> int:
+    """
+    Recover the urgency a patient_queue ZSET score was built from.
+
+    Args:
+        score: Score produced by patient_queue_score
+
+    Returns:
+        Urgency on the 1-10 scale
+    """
+    return -int(score // PATIENT_QUEUE_URGENCY_STEP)
+
+
+def migrate_patient_queue(client) -> int:
+    """
+    Convert a patient_queue left as a LIST by older versions into the ZSET.
+
+    Patients are scored by their urgency; the list order breaks ties, and
+    they all sort before bookings made after the migration.
+
+    Args:
+        client: Redis connection
+
+    Returns:
+        Number of patients migrated (0 if the queue was already a ZSET)
+    """
+    with client.pipeline() as pipe:
+        try:
+            pipe.watch("patient_queue")
+            if pipe.type("patient_queue") != "list":
+                return 0
+            entries = pipe.lrange("patient_queue", 0, -1)
+
+            base_score = patient_queue_score(0) - len(entries)
+            scores = {}
+            for index, patient_json in enumerate(entries):
+                try:
+                    urgency = json.loads(patient_json).get("symptoms_analysis", {}).get("urgency_score", 5)
+                except (ValueError, AttributeError):
+                    urgency = 5
+                scores[patient_json] = base_score - urgency * PATIENT_QUEUE_URGENCY_STEP + index
+
+            pipe.multi()
+            pipe.delete("patient_queue")
+            if scores:
+                pipe.zadd("patient_queue", scores)
+            pipe.execute()
+        except redis.exceptions.WatchError:
+            # Another process changed the queue first (most likely migrating it)
+            return 0
+
+    print(f"[OK] Enhanced Clinic Tools: Migrated {len(entries)} patients from the patient_queue list")
+    return len(entries)
+
+
 # --- Redis Connection ---
 try:
-    redis_client = redis.Redis(
-        host=os.getenv("REDIS_HOST", "localhost"),
-        port=int(os.getenv("REDIS_PORT", 6379)),
-        password=os.getenv("REDIS_PASSWORD", None),
-        db=0,
-        decode_responses=True,
-    )
+    redis_client = get_redis()
     redis_client.ping()
     print("[OK] Enhanced Clinic Tools: Successfully connected to Redis.")
+    migrate_patient_queue(redis_client)
 except redis.exceptions.ConnectionError as e:
     print(f"[ERROR] Enhanced Clinic Tools: Could not connect to Redis. Error: {e}")
     redis_client = None
@@ -118,9 +192,11 @@ def book_intelligent_patient_appointment(
         # Step 2: Analyze symptoms for urgency and timing
         symptoms_analysis = analyze_patient_symptoms(symptoms)
 
-        # Step 3: Generate token number
-        current_queue_length = redis_client.llen("patient_queue")
-        emergency_queue_length = redis_client.llen("emergency_queue")
+        # Step 3: Generate token number (both lengths read in one MULTI/EXEC)
+        pipe = redis_client.pipeline()
+        pipe.zcard("patient_queue")
+        pipe.llen("emergency_queue")
+        current_queue_length, emergency_queue_length = pipe.execute()
         token_number = current_queue_length + emergency_queue_length + 1
 
         # Step 4: Create comprehensive patient record
@@ -143,7 +219,11 @@ def book_intelligent_patient_appointment(
 
         if is_emergency:
             # Emergency handling
-            redis_client.lpush("emergency_queue", json.dumps(patient_data))
+            pipe = redis_client.pipeline()
+            pipe.lpush("emergency_queue", json.dumps(patient_data))
+            # Queue Brain's debounce thread picks this up and optimizes once per burst
+            pipe.setex("queue_dirty", 60, 1)
+            pipe.execute()
             result = f"""
 🚨 EMERGENCY APPOINTMENT CONFIRMED
 ==================================
@@ -169,8 +249,16 @@ Expected Consultation: {symptoms_analysis['estimated_consultation_mins']} minute
 📞 Contact clinic immediately: {os.getenv('CLINIC_CONTACT', '555-MEDISYNC')}
 """
         else:
-            # Regular booking
-            redis_client.rpush("patient_queue", json.dumps(patient_data))
+            # Regular booking: O(log n) insert at its urgency-ordered position
+            patient_json = json.dumps(patient_data)
+            pipe = redis_client.pipeline()
+            pipe.zadd(
+                "patient_queue",
+                {patient_json: patient_queue_score(symptoms_analysis.get("urgency_score", 5))},
+            )
+            pipe.zrank("patient_queue", patient_json)
+            pipe.setex("queue_dirty", 60, 1)
+            _, queue_index, _ = pipe.execute()
 
             # Calculate estimated appointment time
             driving_time = travel_data["travel_options"]["driving"].get(
@@ -181,7 +269,7 @@ Expected Consultation: {symptoms_analysis['estimated_consultation_mins']} minute
 
             # Estimate queue wait dynamically based on symptoms
             avg_consult_mins = symptoms_analysis.get("estimated_consultation_mins", 15)
-            estimated_wait = current_queue_length * avg_consult_mins
+            estimated_wait = queue_index * avg_consult_mins
             appointment_eta = current_time + timedelta(minutes=estimated_wait)
             optimal_departure = appointment_eta - timedelta(
                 minutes=driving_time + 10
@@ -204,7 +292,7 @@ Distance: {travel_data['travel_options']['driving'].get('distance_km', 'Unknown'
 Traffic Delay: {travel_data['travel_options']['driving'].get('traffic_delay_mins', 0)} minutes
 
 [CLOCK] APPOINTMENT SCHEDULING:
-Queue Position: #{current_queue_length + 1}
+Queue Position: #{queue_index + 1}
 Estimated Wait: {estimated_wait} minutes
 Appointment ETA: {appointment_eta.strftime('%H:%M IST')}
 Recommended Departure: {optimal_departure.strftime('%H:%M IST')}
@@ -247,7 +335,7 @@ def get_current_queue_with_real_data() -> str:
     print("[TOOL] [Tool Called] Getting enhanced queue with real data")
 
     # Get queue data
-    regular_queue = redis_client.llen("patient_queue")
+    regular_queue = redis_client.zcard("patient_queue")
     emergency_queue = redis_client.llen("emergency_queue")
 
     if regular_queue == 0 and emergency_queue == 0:
@@ -275,8 +363,8 @@ The clinic queue is currently empty!
     if emergency_queue > 0:
         status_lines.extend(["🚨 EMERGENCY QUEUE (PRIORITY):", "-" * 35])
 
-        for i in range(emergency_queue):
-            patient_json = redis_client.lindex("emergency_queue", i)
+        # Bounded by the length read above, so a concurrent booking can't extend the scan
+        for patient_json in redis_client.lrange("emergency_queue", 0, emergency_queue - 1):
             if patient_json:
                 patient = json.loads(patient_json)
                 travel_info = (
@@ -299,8 +387,7 @@ The clinic queue is currently empty!
         status_lines.extend([f"👥 REGULAR QUEUE ({regular_queue} patients):", "-" * 40])
 
         cumulative_wait = 0
-        for i in range(min(regular_queue, 8)):  # Show first 8
-            patient_json = redis_client.lindex("patient_queue", i)
+        for i, patient_json in enumerate(redis_client.zrange("patient_queue", 0, 7)):  # Show first 8
             if patient_json:
                 patient = json.loads(patient_json)
                 symptoms_info = patient.get("symptoms_analysis", {})
@@ -6,7 +6,7 @@ MongoDB Version - Complete persistence layer migration
 import os
 import json
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple, Union
 
 # Import new data structures and algorithms
 from tools.priority_queue_manager import get_priority_queue_manager, PatientNode
@@ -28,32 +28,17 @@ pq_manager = get_priority_queue_manager(mongodb_manager)
 astar_calculator = get_astar_eta_calculator()
 
 
-def book_intelligent_patient_appointment(
-    name: str, contact_number: str, symptoms: str, location: str
-) -> str:
+def _prepare_patient_data(
+    token_number: Optional[int], name: str, contact_number: str, symptoms: str, location: str
+) -> Dict:
     """
-    Book patient appointment using ADVANCED PRIORITY QUEUE SYSTEM.
-    
-    NEW FEATURES:
-    - Automatic priority calculation (emergency, ETA, symptoms)
-    - A* pathfinding for accurate travel time
-    - Dynamic queue positioning
-    - Starvation prevention through aging
+    Analyze symptoms and travel for a booking and build its queue entry.
+    token_number may be None and filled into patient_data later.
     
-    Args:
-        name: Patient name
-        contact_number: Contact number
-        symptoms: Symptoms description
-        location: Patient location
-        
     Returns:
-        Comprehensive booking confirmation with queue intelligence
+        Dict with the patient_data for the queue plus the analysis used
+        to format the confirmation
     """
-    print(f"[TOOL] [Tool Called] Booking with Priority Queue (MongoDB): '{name}'")
-    
-    # Get next token number from MongoDB
-    token_number = queue_state_model.get_next_token()
-    
     # Analyze symptoms (determines urgency/emergency level)
     symptoms_analysis = analyze_patient_symptoms(symptoms)
     
@@ -65,6 +50,7 @@ def book_intelligent_patient_appointment(
     clinic_coords = travel_data.get("clinic", {})
     
     # Calculate precise ETA using A*
+    astar_result = None
     if origin_coords.get("latitude") and clinic_coords.get("latitude"):
         astar_result = astar_calculator.calculate_eta(
             from_lat=origin_coords["latitude"],
@@ -95,29 +81,42 @@ def book_intelligent_patient_appointment(
         "initial_travel_time_mins": actual_travel_mins,
     }
     
-    # **CORE CHANGE: Add to priority queue instead of Redis list**
-    patient_node = pq_manager.enqueue_patient(patient_data)
+    return {
+        "patient_data": patient_data,
+        "symptoms_analysis": symptoms_analysis,
+        "travel_data": travel_data,
+        "astar_result": astar_result,
+        "actual_travel_mins": actual_travel_mins,
+    }
+
+
+def _format_booking_result(
+    booking: Dict, patient_node: PatientNode, queue_snapshot: Dict,
+    positions: Dict[int, int], waits: Dict[int, int]
+) -> str:
+    """
+    Format the confirmation text for one booked patient.
     
-    # Get current queue snapshot for position info
-    queue_snapshot = pq_manager.get_queue_snapshot()
+    Args:
+        booking: Output of _prepare_patient_data
+        patient_node: The enqueued PatientNode
+        queue_snapshot: Queue snapshot taken after enqueueing
+        positions: Token number -> 1-based position in the snapshot
+        waits: Token number -> minutes of consultations ahead
+    """
+    patient_data = booking["patient_data"]
+    name = patient_data["name"]
+    token_number = patient_data["token_number"]
+    symptoms_analysis = booking["symptoms_analysis"]
+    travel_data = booking["travel_data"]
+    astar_result = booking["astar_result"]
+    actual_travel_mins = booking["actual_travel_mins"]
     
-    # Find patient's position in sorted queue
-    patient_position = next(
-        (i + 1 for i, p in enumerate(queue_snapshot["patients"]) 
-         if p["token_number"] == token_number),
-        "Unknown"
-    )
+    patient_position = positions.get(token_number, "Unknown")
+    estimated_wait = waits.get(token_number, 0)
     
     # Calculate estimated appointment time based on priority queue
     current_time = datetime.utcnow() + timedelta(hours=5, minutes=30)  # IST
-    
-    # Sum consultation times of higher-priority patients
-    estimated_wait = 0
-    for p in queue_snapshot["patients"]:
-        if p["token_number"] == token_number:
-            break
-        estimated_wait += pq_manager.patient_map.get(p["token_number"], PatientNode(0, 0, "", "")).predicted_consult_mins
-    
     appointment_eta = current_time + timedelta(minutes=estimated_wait)
     optimal_departure = appointment_eta - timedelta(minutes=actual_travel_mins + 10)
     
@@ -134,7 +133,7 @@ From: {travel_data['origin']['address']}
 To: {get_real_clinic_location()}
 
 [TRAVEL] A* PATHFINDING TRAVEL ETA:
-Method: {astar_result.get('method', 'free_maps') if 'astar_result' in locals() else 'free_maps'}
+Method: {astar_result.get('method', 'free_maps') if astar_result else 'free_maps'}
 Travel Time: {actual_travel_mins} minutes (with current traffic)
 Distance: {travel_data['travel_options']['driving'].get('distance_km', 'Unknown')} km
 Traffic Status: {travel_data['travel_options']['driving'].get('traffic_delay_mins', 0)} min delay
@@ -173,6 +172,130 @@ Recommended Departure: {optimal_departure.strftime('%H:%M IST')}
     return result.strip()
 
 
+def _queue_positions(queue_snapshot: Dict) -> Tuple[Dict[int, int], Dict[int, int]]:
+    """
+    Map every token in a snapshot to its position and the wait ahead of it.
+    
+    Returns:
+        (positions, waits) keyed by token number
+    """
+    positions = {}
+    waits = {}
+    estimated_wait = 0
+    patient_map = pq_manager.patient_map
+    for i, p in enumerate(queue_snapshot["patients"], 1):
+        token = p["token_number"]
+        positions[token] = i
+        waits[token] = estimated_wait
+        node = patient_map.get(token)
+        if node is not None:
+            estimated_wait += node.predicted_consult_mins
+    return positions, waits
+
+
+def book_intelligent_patient_appointment(
+    name: str, contact_number: str, symptoms: str, location: str
+) -> str:
+    """
+    Book patient appointment using ADVANCED PRIORITY QUEUE SYSTEM.
+    
+    NEW FEATURES:
+    - Automatic priority calculation (emergency, ETA, symptoms)
+    - A* pathfinding for accurate travel time
+    - Dynamic queue positioning
+    - Starvation prevention through aging
+    
+    Args:
+        name: Patient name
+        contact_number: Contact number
+        symptoms: Symptoms description
+        location: Patient location
+        
+    Returns:
+        Comprehensive booking confirmation with queue intelligence
+    """
+    print(f"[TOOL] [Tool Called] Booking with Priority Queue (MongoDB): '{name}'")
+    
+    # Get next token number from MongoDB
+    token_number = queue_state_model.get_next_token()
+    
+    booking = _prepare_patient_data(token_number, name, contact_number, symptoms, location)
+    
+    # **CORE CHANGE: Add to priority queue instead of Redis list**
+    patient_node = pq_manager.enqueue_patient(booking["patient_data"])
+    
+    # Get current queue snapshot for position info
+    queue_snapshot = pq_manager.get_queue_snapshot()
+    positions, waits = _queue_positions(queue_snapshot)
+    
+    return _format_booking_result(booking, patient_node, queue_snapshot, positions, waits)
+
+
+def book_intelligent_patient_appointments(bookings: List[Dict]) -> List[Union[str, Exception]]:
+    """
+    Book several patients at once, sharing the queue and MongoDB round-trips.
+    
+    Token numbers are reserved in one update, all patients are inserted
+    with one enqueue_batch, and positions come from a single snapshot.
+    A booking that fails on its own gets its exception in place of a
+    confirmation and does not hold up the rest of the batch.
+    
+    Args:
+        bookings: Dicts with name, contact_number, symptoms and location
+        
+    Returns:
+        Booking confirmations or exceptions, in input order
+    """
+    if not bookings:
+        return []
+    
+    print(f"[TOOL] [Tool Called] Batch booking {len(bookings)} patients with Priority Queue (MongoDB)")
+    
+    # Analyze each booking first so a failure doesn't use up a token number
+    prepared: List[Union[Dict, Exception]] = []
+    for booking in bookings:
+        try:
+            prepared.append(_prepare_patient_data(
+                None,
+                booking.get("name"),
+                booking.get("contact_number"),
+                booking.get("symptoms"),
+                booking.get("location", "Not provided"),
+            ))
+        except Exception as e:
+            print(f"[ERROR] Could not prepare booking for '{booking.get('name')}': {e}")
+            prepared.append(e)
+    
+    ready = [booking for booking in prepared if not isinstance(booking, Exception)]
+    if ready:
+        tokens = queue_state_model.reserve_tokens(len(ready))
+        for token_number, booking in zip(tokens, ready):
+            booking["patient_data"]["token_number"] = token_number
+        
+        patient_nodes = {
+            node.token_number: node
+            for node in pq_manager.enqueue_batch([booking["patient_data"] for booking in ready])
+        }
+        
+        queue_snapshot = pq_manager.get_queue_snapshot()
+        positions, waits = _queue_positions(queue_snapshot)
+    
+    results = []
+    for booking in prepared:
+        if isinstance(booking, Exception):
+            results.append(booking)
+            continue
+        patient_node = patient_nodes.get(booking["patient_data"]["token_number"])
+        if patient_node is None:
+            results.append(RuntimeError("Could not save the appointment. Please try again."))
+            continue
+        try:
+            results.append(_format_booking_result(booking, patient_node, queue_snapshot, positions, waits))
+        except Exception as e:
+            results.append(e)
+    return results
+
+
 def get_current_queue_with_priority_intelligence() -> str:
     """
     Get current queue status using PRIORITY QUEUE SYSTEM.
@@ -7,19 +7,14 @@ import random
 # --- CORRECTED IMPORT ---
 from tools.symptom_analyzer import analyze_patient_symptoms
 from tools.priority_queue_manager import get_priority_queue_manager
+from tools.redis_client import get_redis
 
 # --- END CORRECTION ---
 
 
 # --- Redis Connection ---
 try:
-    redis_client = redis.Redis(
-        host=os.getenv("REDIS_HOST", "localhost"),
-        port=int(os.getenv("REDIS_PORT", 6379)),
-        password=os.getenv("REDIS_PASSWORD", None),
-        db=0,
-        decode_responses=True,
-    )
+    redis_client = get_redis()
     redis_client.ping()
     print("[OK] ETA Tools: Successfully connected to Redis.")
 except redis.exceptions.ConnectionError as e:
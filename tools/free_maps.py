@@ -1,10 +1,15 @@
 import requests
 from typing import Dict, Tuple, Optional, List
+import hashlib
+import json
 import math
 import time
 import os
 from datetime import datetime
 
+# Geocodes and OSRM routes are also cached in Redis so they survive restarts
+MAPS_CACHE_TTL_SECS = 86400
+
 class FreeMapsService:
     """Free alternative to Google Maps using OpenStreetMap and OSRM"""
     
@@ -13,13 +18,57 @@ class FreeMapsService:
         self.nominatim_base = "https://nominatim.openstreetmap.org"
         self.user_agent = "MediSync/1.0 (Healthcare Queue Management)"
         self._geocode_cache = {}
+        self._route_cache = {}
+        self._redis = self._connect_cache()
         print("[OK] Free Maps Service initialized (OpenStreetMap + OSRM)")
     
+    def _connect_cache(self):
+        """Redis client for the shared maps cache, or None if Redis is unavailable"""
+        try:
+            from tools.redis_client import get_redis
+            client = get_redis()
+            client.ping()
+            return client
+        except Exception as e:
+            print(f"[WARNING] Maps Redis cache disabled: {e}")
+            return None
+    
+    def _cache_get(self, key: str):
+        """Read a JSON value from the Redis maps cache"""
+        if self._redis is None:
+            return None
+        try:
+            cached = self._redis.get(key)
+            return json.loads(cached) if cached else None
+        except Exception as e:
+            # Keep the client: the pool reconnects once Redis is back
+            print(f"[WARNING] Maps cache read failed: {e}")
+            return None
+    
+    def _cache_set(self, key: str, value) -> None:
+        """Store a JSON value in the Redis maps cache"""
+        if self._redis is None:
+            return
+        try:
+            self._redis.setex(key, MAPS_CACHE_TTL_SECS, json.dumps(value))
+        except Exception as e:
+            print(f"[WARNING] Maps cache write failed: {e}")
+    
     def geocode_address(self, address: str) -> Tuple[Optional[float], Optional[float]]:
         """Convert address to lat/lng using Nominatim (OpenStreetMap)"""
+        # Case and spacing don't change a Nominatim result, so they share a cache entry
+        address_key = " ".join(address.lower().split())
+        
         # Check cache first
-        if address in self._geocode_cache:
-            return self._geocode_cache[address]
+        if address_key in self._geocode_cache:
+            return self._geocode_cache[address_key]
+        
+        cache_key = "geo:" + hashlib.sha1(address_key.encode("utf-8")).hexdigest()
+        cached = self._cache_get(cache_key)
+        if cached:
+            coords = (cached[0], cached[1])
+            self._geocode_cache[address_key] = coords
+            return coords
         
         try:
             params = {
@@ -43,7 +92,8 @@ class FreeMapsService:
             if response.status_code == 200 and response.json():
                 data = response.json()[0]
                 coords = (float(data['lat']), float(data['lon']))
-                self._geocode_cache[address] = coords
+                self._geocode_cache[address_key] = coords
+                self._cache_set(cache_key, coords)
                 print(f"[OK] Geocoded '{address}' -> {coords[0]:.4f}, {coords[1]:.4f}")
                 return coords
         except Exception as e:
@@ -51,7 +101,7 @@ class FreeMapsService:
         
         # Fallback to Mumbai coordinates
         fallback = self._get_mumbai_fallback(address)
-        self._geocode_cache[address] = fallback
+        self._geocode_cache[address_key] = fallback
         return fallback
     
     def _get_mumbai_fallback(self, address: str) -> Tuple[float, float]:
@@ -88,9 +138,53 @@ class FreeMapsService:
         destination: Tuple[float, float]
     ) -> Dict:
         """Calculate distance and travel time using OSRM"""
+        route = self._get_osrm_route(origin, destination)
+        
+        if route:
+            distance_km = route[0] / 1000
+            duration_mins = route[1] / 60
+            
+            # Add traffic estimate (20-30% increase during peak hours)
+            hour = datetime.now().hour
+            is_peak = (9 <= hour <= 11) or (12 <= hour <= 14) or (16 <= hour <= 18)
+            traffic_multiplier = 1.3 if is_peak else 1.1
+            
+            traffic_duration_mins = duration_mins * traffic_multiplier
+            traffic_delay = traffic_duration_mins - duration_mins
+            
+            result = {
+                'distance_km': round(distance_km, 1),
+                'duration_minutes': round(duration_mins),
+                'traffic_duration_minutes': round(traffic_duration_mins),
+                'traffic_delay_minutes': round(traffic_delay),
+                'status': 'OK'
+            }
+            
+            print(f"[OK] Route: {result['distance_km']}km, {result['traffic_duration_minutes']}min")
+            return result
+        
+        # Fallback: Calculate straight-line distance
+        return self._calculate_fallback_route(origin, destination)
+    
+    def _get_osrm_route(
+        self,
+        origin: Tuple[float, float],
+        destination: Tuple[float, float]
+    ) -> Optional[Tuple[float, float]]:
+        """Raw OSRM (distance_m, duration_s), cached; traffic is applied by the caller"""
         origin_lat, origin_lng = origin
         dest_lat, dest_lng = destination
         
+        cache_key = f"route:{origin_lat:.4f},{origin_lng:.4f};{dest_lat:.4f},{dest_lng:.4f}"
+        if cache_key in self._route_cache:
+            return self._route_cache[cache_key]
+        
+        cached = self._cache_get(cache_key)
+        if cached:
+            route = (cached[0], cached[1])
+            self._route_cache[cache_key] = route
+            return route
+        
         try:
             # OSRM expects lng,lat format
             url = f"{self.osrm_base}/route/v1/driving/{origin_lng},{origin_lat};{dest_lng},{dest_lat}"
@@ -101,34 +195,15 @@ class FreeMapsService:
             if response.status_code == 200:
                 data = response.json()
                 if data.get('code') == 'Ok' and data.get('routes'):
-                    route = data['routes'][0]
-                    
-                    distance_km = route['distance'] / 1000
-                    duration_mins = route['duration'] / 60
-                    
-                    # Add traffic estimate (20-30% increase during peak hours)
-                    hour = datetime.now().hour
-                    is_peak = (9 <= hour <= 11) or (12 <= hour <= 14) or (16 <= hour <= 18)
-                    traffic_multiplier = 1.3 if is_peak else 1.1
-                    
-                    traffic_duration_mins = duration_mins * traffic_multiplier
-                    traffic_delay = traffic_duration_mins - duration_mins
-                    
-                    result = {
-                        'distance_km': round(distance_km, 1),
-                        'duration_minutes': round(duration_mins),
-                        'traffic_duration_minutes': round(traffic_duration_mins),
-                        'traffic_delay_minutes': round(traffic_delay),
-                        'status': 'OK'
-                    }
-                    
-                    print(f"[OK] Route: {result['distance_km']}km, {result['traffic_duration_minutes']}min")
-                    return result
+                    best = data['routes'][0]
+                    route = (best['distance'], best['duration'])
+                    self._route_cache[cache_key] = route
+                    self._cache_set(cache_key, route)
+                    return route
         except Exception as e:
             print(f"[WARNING] OSRM routing failed: {e}")
         
-        # Fallback: Calculate straight-line distance
-        return self._calculate_fallback_route(origin, destination)
+        return None
     
     def _calculate_fallback_route(
         self,
@@ -0,0 +1,18 @@
+"""
+Shared JSON helpers for the API wrappers, the worker and the test scripts.
+orjson does the encoding and decoding; values it can't serialize
+(datetimes from MongoDB, ObjectIds) fall back to str().
+"""
+
+import orjson
+
+
+def json_dumps(obj, indent: bool = False) -> str:
+    """Serialize to a JSON string, optionally indented by two spaces"""
+    option = orjson.OPT_NON_STR_KEYS
+    if indent:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(obj, default=str, option=option).decode()
+
+
+json_loads = orjson.loads
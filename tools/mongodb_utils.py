@@ -7,7 +7,7 @@ import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from pymongo import MongoClient, ASCENDING, DESCENDING
-from pymongo.errors import PyMongoError, DuplicateKeyError
+from pymongo.errors import BulkWriteError, PyMongoError, DuplicateKeyError
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -91,9 +91,18 @@ class MongoDBManager:
             # Patient collection indexes
             patients = self._db.patients
             patients.create_index("tokenNumber", unique=True)
-            patients.create_index([("status", ASCENDING), ("isActive", ASCENDING)])
+            # Equality on status/isActive, then the get_active_queue sort order,
+            # so the active queue reads in index order with no in-memory sort
+            patients.create_index([
+                ("status", ASCENDING),
+                ("isActive", ASCENDING),
+                ("emergencyLevel", DESCENDING),
+                ("priorityScore", ASCENDING),
+            ], name="active_queue_idx")
             patients.create_index([("emergencyLevel", DESCENDING), ("priorityScore", ASCENDING)])
             patients.create_index("bookingTime")
+            # Lets long-lived processes pick up changes made by other processes
+            patients.create_index("updatedAt")
             
             # QueueState collection indexes
             queue_state = self._db.queuestate
@@ -145,8 +154,9 @@ class PatientModel:
         
         try:
             # Add metadata
-            patient_data["createdAt"] = datetime.utcnow()
-            patient_data["updatedAt"] = datetime.utcnow()
+            now = datetime.utcnow()
+            patient_data["createdAt"] = now
+            patient_data["updatedAt"] = now
             patient_data["isActive"] = True
             
             result = self.collection.insert_one(patient_data)
@@ -161,6 +171,37 @@ class PatientModel:
             print(f"[WARNING] MongoDB error creating patient: {e}")
             return None
     
+    def create_many(self, patients_data: List[Dict]) -> List[Dict]:
+        """Create several patient documents with a single insert"""
+        if self.collection is None:
+            print("[WARNING] MongoDB not available")
+            return []
+        
+        if not patients_data:
+            return []
+        
+        now = datetime.utcnow()
+        for patient_data in patients_data:
+            patient_data["createdAt"] = now
+            patient_data["updatedAt"] = now
+            patient_data["isActive"] = True
+        
+        try:
+            # Unordered so one duplicate token doesn't block the rest
+            result = self.collection.insert_many(patients_data, ordered=False)
+            for patient_data, inserted_id in zip(patients_data, result.inserted_ids):
+                patient_data["_id"] = inserted_id
+            
+            print(f"[OK] {len(result.inserted_ids)} patients created in MongoDB")
+            return patients_data
+        except BulkWriteError as e:
+            failed = {error["index"] for error in e.details.get("writeErrors", [])}
+            print(f"[WARNING] {len(failed)} patient tokens already exist")
+            return [p for i, p in enumerate(patients_data) if i not in failed]
+        except PyMongoError as e:
+            print(f"[WARNING] MongoDB error creating patients: {e}")
+            return []
+    
     def find_by_token(self, token_number: int) -> Optional[Dict]:
         """Find patient by token number"""
         if self.collection is None:
@@ -192,6 +233,17 @@ class PatientModel:
             print(f"[WARNING] MongoDB error getting queue: {e}")
             return []
     
+    def get_changed_since(self, since: datetime) -> Optional[List[Dict]]:
+        """Get patients written after a time; None if MongoDB could not be read"""
+        if self.collection is None:
+            return None
+        
+        try:
+            return list(self.collection.find({"updatedAt": {"$gt": since}}))
+        except PyMongoError as e:
+            print(f"[WARNING] MongoDB error getting changed patients: {e}")
+            return None
+    
     def update_patient(self, token_number: int, updates: Dict) -> bool:
         """Update patient attributes"""
         if self.collection is None:
@@ -216,12 +268,13 @@ class PatientModel:
             return False
         
         try:
+            now = datetime.utcnow()
             result = self.collection.update_one(
                 {"tokenNumber": token_number},
                 {"$set": {
                     "status": "IN_CONSULTATION",
-                    "consultationStartTime": datetime.utcnow(),
-                    "updatedAt": datetime.utcnow()
+                    "consultationStartTime": now,
+                    "updatedAt": now
                 }}
             )
             
@@ -242,19 +295,20 @@ class PatientModel:
             
             consultation_start = patient.get("consultationStartTime")
             actual_consultation_mins = None
+            now = datetime.utcnow()
             
             if consultation_start:
-                duration = datetime.utcnow() - consultation_start
+                duration = now - consultation_start
                 actual_consultation_mins = duration.total_seconds() / 60
             
             result = self.collection.update_one(
                 {"tokenNumber": token_number},
                 {"$set": {
                     "status": "COMPLETED",
-                    "completedAt": datetime.utcnow(),
+                    "completedAt": now,
                     "isActive": False,
                     "actualConsultationMins": actual_consultation_mins,
-                    "updatedAt": datetime.utcnow()
+                    "updatedAt": now
                 }}
             )
             
@@ -302,11 +356,12 @@ class QueueStateModel:
             
             if not state:
                 # Create initial state
+                now = datetime.utcnow()
                 state = {
                     "type": "GLOBAL",
                     "currentTokenNumber": 0,
                     "dailyStats": {
-                        "date": datetime.utcnow().date().isoformat(),
+                        "date": now.date().isoformat(),
                         "totalBookings": 0,
                         "completedConsultations": 0,
                         "cancelledAppointments": 0,
@@ -326,8 +381,8 @@ class QueueStateModel:
                         "maxWaitTimeMins": 120,
                         "defaultConsultationMins": 15
                     },
-                    "createdAt": datetime.utcnow(),
-                    "updatedAt": datetime.utcnow()
+                    "createdAt": now,
+                    "updatedAt": now
                 }
                 
                 self.collection.insert_one(state)
@@ -360,6 +415,30 @@ class QueueStateModel:
             print(f"[WARNING] MongoDB error getting next token: {e}")
             return 1
     
+    def reserve_tokens(self, count: int) -> List[int]:
+        """Reserve a block of consecutive token numbers with one update"""
+        if self.collection is None or count <= 0:
+            return list(range(1, count + 1))
+        
+        try:
+            result = self.collection.find_one_and_update(
+                {"type": "GLOBAL"},
+                {
+                    "$inc": {"currentTokenNumber": count},
+                    "$set": {"updatedAt": datetime.utcnow()}
+                },
+                return_document=True
+            )
+            
+            if result:
+                last_token = result["currentTokenNumber"]
+                return list(range(last_token - count + 1, last_token + 1))
+            
+            return list(range(1, count + 1))
+        except PyMongoError as e:
+            print(f"[WARNING] MongoDB error reserving tokens: {e}")
+            return list(range(1, count + 1))
+    
     def record_booking(self, is_emergency: bool = False) -> bool:
         """Record a new booking in stats"""
         if self.collection is None:
@@ -384,6 +463,30 @@ class QueueStateModel:
             print(f"[WARNING] MongoDB error recording booking: {e}")
             return False
     
+    def record_bookings(self, count: int, emergency_count: int = 0) -> bool:
+        """Record several new bookings in stats with one update"""
+        if self.collection is None:
+            return False
+        
+        try:
+            update = {
+                "$inc": {"dailyStats.totalBookings": count},
+                "$set": {"updatedAt": datetime.utcnow()}
+            }
+            
+            if emergency_count:
+                update["$inc"]["dailyStats.emergencyPatients"] = emergency_count
+            
+            result = self.collection.update_one(
+                {"type": "GLOBAL"},
+                update
+            )
+            
+            return result.modified_count > 0
+        except PyMongoError as e:
+            print(f"[WARNING] MongoDB error recording bookings: {e}")
+            return False
+    
     def record_completion(self, consultation_mins: float = None) -> bool:
         """Record completed consultation"""
         if self.collection is None:
@@ -428,13 +531,14 @@ class QueueStateModel:
             return False
         
         try:
+            now = datetime.utcnow()
             result = self.collection.update_one(
                 {"type": "GLOBAL"},
                 {
                     "$inc": {"currentMetrics.totalReorders": 1},
                     "$set": {
-                        "currentMetrics.lastReorderTime": datetime.utcnow(),
-                        "updatedAt": datetime.utcnow()
+                        "currentMetrics.lastReorderTime": now,
+                        "updatedAt": now
                     }
                 }
             )
@@ -459,8 +563,9 @@ class NotificationModel:
             return None
         
         try:
-            notification_data["createdAt"] = datetime.utcnow()
-            notification_data["updatedAt"] = datetime.utcnow()
+            now = datetime.utcnow()
+            notification_data["createdAt"] = now
+            notification_data["updatedAt"] = now
             
             result = self.collection.insert_one(notification_data)
             notification_data["_id"] = result.inserted_id
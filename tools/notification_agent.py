@@ -3,16 +3,11 @@ import json
 import redis
 from datetime import datetime, timedelta
 from tools.priority_queue_manager import get_priority_queue_manager
+from tools.redis_client import get_redis
 
 # Redis connection
 try:
-    redis_client = redis.Redis(
-        host=os.getenv("REDIS_HOST", "localhost"),
-        port=int(os.getenv("REDIS_PORT", 6379)),
-        password=os.getenv("REDIS_PASSWORD", None),
-        db=0,
-        decode_responses=True,
-    )
+    redis_client = get_redis()
     redis_client.ping()
     print("[OK] Notification Agent: Successfully connected to Redis.")
 except redis.exceptions.ConnectionError as e:
@@ -10,16 +10,11 @@ from tools.notification_agent import (
     send_eta_update_notifications,
 )
 from tools.clinic_monitor import get_clinic_status_dashboard
+from tools.redis_client import get_redis
 
 # Redis connection
 try:
-    redis_client = redis.Redis(
-        host=os.getenv("REDIS_HOST", "localhost"),
-        port=int(os.getenv("REDIS_PORT", 6379)),
-        password=os.getenv("REDIS_PASSWORD", None),
-        db=0,
-        decode_responses=True,
-    )
+    redis_client = get_redis()
     redis_client.ping()
     print("[OK] Orchestrator Brain: Successfully connected to Redis.")
     
@@ -93,14 +88,15 @@ def monitor_and_trigger_orchestration() -> str:
 
     print("👁️ [Orchestrator] Monitoring system for orchestration triggers...")
 
-    # Check for completion triggers
-    completion_trigger = redis_client.get("last_completed_patient")
-    manual_trigger = redis_client.get("orchestration_trigger")
+    # Check for completion and manual triggers in one round trip
+    completion_trigger, manual_trigger = redis_client.mget(
+        "last_completed_patient", "orchestration_trigger"
+    )
 
     triggers_found = []
+    completion_data = json.loads(completion_trigger) if completion_trigger else None
 
-    if completion_trigger:
-        completion_data = json.loads(completion_trigger)
+    if completion_data:
         if completion_data.get("optimization_trigger"):
             triggers_found.append(
                 f"Patient #{completion_data.get('completed_patient_token')} completed"
@@ -131,13 +127,14 @@ Action: Standby mode
     orchestration_result = execute_intelligent_orchestration()
 
     # Clear triggers
-    if completion_trigger:
-        completion_data = json.loads(completion_trigger)
+    pipe = redis_client.pipeline()
+    if completion_data:
         completion_data["optimization_trigger"] = False
-        redis_client.set("last_completed_patient", json.dumps(completion_data))
+        pipe.set("last_completed_patient", json.dumps(completion_data))
 
     if manual_trigger:
-        redis_client.delete("orchestration_trigger")
+        pipe.delete("orchestration_trigger")
+    pipe.execute()
 
     return f"""
 🚨 ORCHESTRATION TRIGGERS DETECTED
@@ -18,6 +18,7 @@ MIGRATION: Now uses MongoDB instead of Redis for all persistence
 import heapq
 import json
 import os
+import threading
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
@@ -34,6 +35,10 @@ class EmergencyLevel(IntEnum):
     CRITICAL = 2
 
 
+# Level names indexed by EmergencyLevel value
+EMERGENCY_LEVEL_NAMES = tuple(level.name for level in EmergencyLevel)
+
+
 @dataclass(order=True)
 class PatientNode:
     """
@@ -105,10 +110,19 @@ class PriorityQueueManager:
         # Waiting time tracker for aging
         self.wait_tracker: Dict[int, float] = {}
         
+        # Guards the heaps and maps (bookings, API threads and the aging cycle)
+        self._lock = threading.RLock()
+        
+        # Bumped on every queue change; get_queue_snapshot() reuses its last
+        # result until the version moves
+        self._version = 0
+        self._snapshot_cache: Optional[Tuple[int, Dict]] = None
+        
         # Configuration
         self.weights = PriorityWeights()
         self.aging_rate_mins = 5  # Boost priority every 5 minutes
         self.starvation_threshold_mins = 30  # Alert if waiting >30 mins
+        self.sync_overlap = timedelta(seconds=1)  # Re-read window for clock skew between writers
         
         # MongoDB for persistence
         self.mongodb_manager = mongodb_manager or get_mongodb_manager()
@@ -120,6 +134,9 @@ class PriorityQueueManager:
         self.total_dequeued = 0
         self.reorder_count = 0
         
+        # Writes to MongoDB after this time are picked up by sync_from_mongodb()
+        self._synced_at = datetime.utcnow()
+        
         # Load existing patients from MongoDB
         self._load_from_mongodb()
         
@@ -141,12 +158,13 @@ class PriorityQueueManager:
           + w4 * waiting_time            (negative = aging boost)
           + w5 * arrival_probability     (likely arrivals favored)
         """
+        weights = self.weights
         score = (
-            self.weights.EMERGENCY * patient.emergency_level +
-            self.weights.TRAVEL_ETA * patient.travel_eta_mins +
-            self.weights.CONSULTATION_TIME * patient.predicted_consult_mins +
-            self.weights.WAITING_TIME * patient.waiting_time_mins +
-            self.weights.ARRIVAL_PROB * (1.0 - patient.arrival_probability)
+            weights.EMERGENCY * patient.emergency_level +
+            weights.TRAVEL_ETA * patient.travel_eta_mins +
+            weights.CONSULTATION_TIME * patient.predicted_consult_mins +
+            weights.WAITING_TIME * patient.waiting_time_mins +
+            weights.ARRIVAL_PROB * (1.0 - patient.arrival_probability)
         )
         
         return round(score, 2)
@@ -161,6 +179,65 @@ class PriorityQueueManager:
         Returns:
             PatientNode inserted into queue
         """
+        patient, mongo_patient_data = self._build_patient(patient_data)
+        
+        # Persist to MongoDB
+        self.patient_model.create(mongo_patient_data)
+        
+        # Record booking in queue state
+        self.queue_state.record_booking(is_emergency=(patient.emergency_level != EmergencyLevel.NORMAL))
+        
+        self._push_patient(patient)
+        
+        return patient
+    
+    def enqueue_batch(self, patients_data: List[Dict]) -> List[PatientNode]:
+        """
+        Add several patients with one MongoDB insert and one stats update.
+        
+        Args:
+            patients_data: List of patient information dicts
+            
+        Returns:
+            PatientNodes inserted into queue, in input order. Patients that
+            could not be saved to MongoDB are left out of the queue.
+        """
+        built = [self._build_patient(patient_data) for patient_data in patients_data]
+        if not built:
+            return []
+        
+        # Persist all patients in one round-trip
+        saved = self.patient_model.create_many([mongo_data for _, mongo_data in built])
+        saved_tokens = {mongo_data["tokenNumber"] for mongo_data in saved}
+        if len(saved_tokens) < len(built):
+            print(f"[WARNING] {len(built) - len(saved_tokens)} of {len(built)} patients "
+                  f"were not saved to MongoDB and were not queued")
+            built = [(patient, mongo_data) for patient, mongo_data in built
+                     if patient.token_number in saved_tokens]
+            if not built:
+                return []
+        
+        # Record all bookings in one queue state update
+        emergency_count = sum(
+            1 for patient, _ in built if patient.emergency_level != EmergencyLevel.NORMAL
+        )
+        self.queue_state.record_bookings(len(built), emergency_count)
+        
+        patients = [patient for patient, _ in built]
+        self._push_patients(patients)
+        
+        return patients
+    
+    def _build_patient(self, patient_data: Dict) -> Tuple[PatientNode, Dict]:
+        """
+        Create a scored PatientNode and its MongoDB document.
+        
+        Args:
+            patient_data: Patient information dict
+            
+        Returns:
+            Tuple of (PatientNode, MongoDB patient document)
+        """
         # Create patient node
         symptoms_analysis = patient_data.get("symptoms_analysis", {})
         travel_data = patient_data.get("travel_data", {})
@@ -182,6 +259,10 @@ class PriorityQueueManager:
             "traffic_duration_mins", 20
         )
         
+        # One clock read per booking; ISO strings are only built where stored
+        now = datetime.utcnow()
+        now_iso = now.isoformat()
+        
         patient = PatientNode(
             priority_score=0.0,  # Will be calculated
             token_number=patient_data["token_number"],
@@ -195,14 +276,13 @@ class PriorityQueueManager:
             symptoms_analysis=symptoms_analysis,
             location=patient_data.get("location", ""),
             travel_data=travel_data,
-            booking_time=patient_data.get("booking_time", datetime.utcnow().isoformat()),
+            booking_time=patient_data.get("booking_time") or now_iso,
         )
         
         # Calculate priority score
         patient.priority_score = self.calculate_priority_score(patient)
-        patient.last_priority_update = datetime.utcnow().isoformat()
+        patient.last_priority_update = now_iso
         
-        # Persist to MongoDB
         mongo_patient_data = {
             "tokenNumber": patient.token_number,
             "name": patient.name,
@@ -217,45 +297,74 @@ class PriorityQueueManager:
             "predictedConsultMins": patient.predicted_consult_mins,
             "waitingTimeMins": 0.0,
             "arrivalProbability": patient.arrival_probability,
-            "bookingTime": datetime.utcnow(),
-            "lastPriorityUpdate": datetime.utcnow(),
+            "bookingTime": now,
+            "lastPriorityUpdate": now,
             "status": "WAITING",
             "isActive": True,
         }
         
-        self.patient_model.create(mongo_patient_data)
-        
-        # Record booking in queue state
-        self.queue_state.record_booking(is_emergency=(emergency_level != EmergencyLevel.NORMAL))
-        
-        # Add to appropriate queue
-        if patient.emergency_level == EmergencyLevel.CRITICAL:
-            # Emergency queue (max-heap via negative scores)
-            emergency_node = PatientNode(
-                priority_score=-patient.priority_score,  # Negative for max-heap
-                token_number=patient.token_number,
-                name=patient.name,
-                contact_number=patient.contact_number,
-                emergency_level=patient.emergency_level,
-                travel_eta_mins=patient.travel_eta_mins,
-                predicted_consult_mins=patient.predicted_consult_mins,
-                symptoms=patient.symptoms,
-                symptoms_analysis=patient.symptoms_analysis,
-            )
-            heapq.heappush(self.emergency_queue, emergency_node)
-            print(f"🚨 [Emergency Queue] Added Token #{patient.token_number} (Critical)")
-        else:
-            # Main queue (min-heap)
-            heapq.heappush(self.main_queue, patient)
-            print(f"[OK] [Main Queue] Added Token #{patient.token_number} (Priority: {patient.priority_score})")
-        
-        # Add to hash map for O(1) lookups
-        self.patient_map[patient.token_number] = patient
-        self.wait_tracker[patient.token_number] = 0.0
-        
-        self.total_enqueued += 1
+        return patient, mongo_patient_data
+    
+    def _push_patient(self, patient: PatientNode):
+        """Push a built patient onto its heap and register it for lookups"""
+        with self._lock:
+            # Add to appropriate queue
+            if patient.emergency_level == EmergencyLevel.CRITICAL:
+                # Emergency queue (max-heap via negative scores)
+                heapq.heappush(self.emergency_queue, self._emergency_node(patient))
+                print(f"🚨 [Emergency Queue] Added Token #{patient.token_number} (Critical)")
+            else:
+                # Main queue (min-heap)
+                heapq.heappush(self.main_queue, patient)
+                print(f"[OK] [Main Queue] Added Token #{patient.token_number} (Priority: {patient.priority_score})")
+            
+            # Add to hash map for O(1) lookups
+            self.patient_map[patient.token_number] = patient
+            self.wait_tracker[patient.token_number] = 0.0
+            
+            self.total_enqueued += 1
+            self._version += 1
+    
+    def _push_patients(self, patients: List[PatientNode]):
+        """Add several built patients, heapifying once instead of pushing one by one"""
+        emergency_nodes = [
+            self._emergency_node(p) for p in patients
+            if p.emergency_level == EmergencyLevel.CRITICAL
+        ]
+        main_nodes = [p for p in patients if p.emergency_level != EmergencyLevel.CRITICAL]
+        
+        with self._lock:
+            # O(n) heapify over the combined list beats n O(log n) pushes
+            if emergency_nodes:
+                self.emergency_queue.extend(emergency_nodes)
+                heapq.heapify(self.emergency_queue)
+            if main_nodes:
+                self.main_queue.extend(main_nodes)
+                heapq.heapify(self.main_queue)
+            
+            # Add to hash map for O(1) lookups
+            self.patient_map.update((p.token_number, p) for p in patients)
+            self.wait_tracker.update((p.token_number, 0.0) for p in patients)
+            
+            self.total_enqueued += len(patients)
+            self._version += 1
         
-        return patient
+        print(f"[OK] [Bulk Enqueue] Added {len(patients)} patients "
+              f"({len(emergency_nodes)} emergency, {len(main_nodes)} main)")
+    
+    def _emergency_node(self, patient: PatientNode) -> PatientNode:
+        """Copy a patient for the emergency max-heap (negated score)"""
+        return PatientNode(
+            priority_score=-patient.priority_score,  # Negative for max-heap
+            token_number=patient.token_number,
+            name=patient.name,
+            contact_number=patient.contact_number,
+            emergency_level=patient.emergency_level,
+            travel_eta_mins=patient.travel_eta_mins,
+            predicted_consult_mins=patient.predicted_consult_mins,
+            symptoms=patient.symptoms,
+            symptoms_analysis=patient.symptoms_analysis,
+        )
     
     def dequeue_next_patient(self) -> Optional[PatientNode]:
         """
@@ -266,28 +375,28 @@ class PriorityQueueManager:
         Returns:
             Next patient to be served, or None if queue empty
         """
-        # Check emergency queue first
-        if self.emergency_queue:
-            patient = heapq.heappop(self.emergency_queue)
-            patient.priority_score = -patient.priority_score  # Restore original score
-            print(f"🚨 [Dequeue] Emergency patient: Token #{patient.token_number}")
-        elif self.main_queue:
-            patient = heapq.heappop(self.main_queue)
-            print(f"[OK] [Dequeue] Main queue patient: Token #{patient.token_number}")
-        else:
-            return None
+        with self._lock:
+            # Check emergency queue first
+            if self.emergency_queue:
+                patient = heapq.heappop(self.emergency_queue)
+                patient.priority_score = -patient.priority_score  # Restore original score
+                print(f"🚨 [Dequeue] Emergency patient: Token #{patient.token_number}")
+            elif self.main_queue:
+                patient = heapq.heappop(self.main_queue)
+                print(f"[OK] [Dequeue] Main queue patient: Token #{patient.token_number}")
+            else:
+                return None
+            
+            # Remove from tracking
+            self.patient_map.pop(patient.token_number, None)
+            self.wait_tracker.pop(patient.token_number, None)
+            
+            self.total_dequeued += 1
+            self._version += 1
         
         # Update MongoDB status to IN_CONSULTATION
         self.patient_model.start_consultation(patient.token_number)
         
-        # Remove from tracking
-        if patient.token_number in self.patient_map:
-            del self.patient_map[patient.token_number]
-        if patient.token_number in self.wait_tracker:
-            del self.wait_tracker[patient.token_number]
-        
-        self.total_dequeued += 1
-        
         return patient
     
     def peek(self) -> Optional[PatientNode]:
@@ -298,69 +407,101 @@ class PriorityQueueManager:
         Returns:
             Next patient to be served, or None if queue empty
         """
-        # Check emergency queue first
-        if self.emergency_queue:
-            patient = self.emergency_queue[0]
-            # Return a copy with restored positive score
-            peek_patient = PatientNode(
-                priority_score=-patient.priority_score,
-                token_number=patient.token_number,
-                name=patient.name,
-                contact_number=patient.contact_number,
-                emergency_level=patient.emergency_level,
-                travel_eta_mins=patient.travel_eta_mins,
-                predicted_consult_mins=patient.predicted_consult_mins,
-                symptoms=patient.symptoms,
-                symptoms_analysis=patient.symptoms_analysis,
-            )
-            return peek_patient
-        elif self.main_queue:
-            return self.main_queue[0]
-        else:
-            return None
+        with self._lock:
+            # Check emergency queue first
+            if self.emergency_queue:
+                patient = self.emergency_queue[0]
+                # Return a copy with restored positive score
+                peek_patient = PatientNode(
+                    priority_score=-patient.priority_score,
+                    token_number=patient.token_number,
+                    name=patient.name,
+                    contact_number=patient.contact_number,
+                    emergency_level=patient.emergency_level,
+                    travel_eta_mins=patient.travel_eta_mins,
+                    predicted_consult_mins=patient.predicted_consult_mins,
+                    symptoms=patient.symptoms,
+                    symptoms_analysis=patient.symptoms_analysis,
+                )
+                return peek_patient
+            elif self.main_queue:
+                return self.main_queue[0]
+            else:
+                return None
     
-    def remove_patient(self, token_number: int) -> bool:
+    def remove_patient(self, token_number: int, mark_cancelled: bool = True) -> bool:
         """
         Remove a specific patient from the queue by token number.
-        Marks as CANCELLED in MongoDB.
+        Marks as CANCELLED in MongoDB unless mark_cancelled is False.
         
         Args:
             token_number: Token number of patient to remove
+            mark_cancelled: False when the patient left for another reason
+                (e.g. completed) and MongoDB is already up to date
             
         Returns:
             True if patient was found and removed, False otherwise
         """
-        if token_number not in self.patient_map:
-            print(f"[WARNING] Patient token #{token_number} not found in queue")
-            return False
-        
-        patient = self.patient_map[token_number]
+        with self._lock:
+            patient = self.patient_map.pop(token_number, None)
+            if patient is None:
+                print(f"[WARNING] Patient token #{token_number} not found in queue")
+                return False
+            
+            # Remove from appropriate queue
+            if patient.emergency_level == EmergencyLevel.CRITICAL:
+                # Remove from emergency queue
+                self.emergency_queue = [p for p in self.emergency_queue if p.token_number != token_number]
+                heapq.heapify(self.emergency_queue)
+                print(f"🚨 [Remove] Removed Token #{token_number} from emergency queue")
+            else:
+                # Remove from main queue
+                self.main_queue = [p for p in self.main_queue if p.token_number != token_number]
+                heapq.heapify(self.main_queue)
+                print(f"[OK] [Remove] Removed Token #{token_number} from main queue")
+            
+            # Remove from tracking
+            self.wait_tracker.pop(token_number, None)
+            
+            self.total_dequeued += 1
+            self._version += 1
         
         # Mark as cancelled in MongoDB
-        self.patient_model.cancel_patient(token_number)
-        self.queue_state.record_cancellation()
-        
-        # Remove from appropriate queue
-        if patient.emergency_level == EmergencyLevel.CRITICAL:
-            # Remove from emergency queue
-            self.emergency_queue = [p for p in self.emergency_queue if p.token_number != token_number]
-            heapq.heapify(self.emergency_queue)
-            print(f"🚨 [Remove] Removed Token #{token_number} from emergency queue")
-        else:
-            # Remove from main queue
-            self.main_queue = [p for p in self.main_queue if p.token_number != token_number]
-            heapq.heapify(self.main_queue)
-            print(f"[OK] [Remove] Removed Token #{token_number} from main queue")
-        
-        # Remove from tracking
-        del self.patient_map[token_number]
-        if token_number in self.wait_tracker:
-            del self.wait_tracker[token_number]
-        
-        self.total_dequeued += 1
+        if mark_cancelled:
+            self.patient_model.cancel_patient(token_number)
+            self.queue_state.record_cancellation()
         
         return True
     
+    def clear(self):
+        """
+        Drop every patient from the in-memory queue.
+        MongoDB is left untouched.
+        """
+        with self._lock:
+            self.main_queue = []
+            self.emergency_queue = []
+            self.patient_map.clear()
+            self.wait_tracker.clear()
+            self._version += 1
+    
+    def remove_patients(self, token_numbers: List[int], mark_cancelled: bool = False) -> int:
+        """
+        Remove several patients under one hold of the queue lock.
+        
+        Args:
+            token_numbers: Token numbers of patients to remove
+            mark_cancelled: Passed through to remove_patient()
+            
+        Returns:
+            Number of patients found and removed
+        """
+        with self._lock:
+            return sum(
+                self.remove_patient(token_number, mark_cancelled=mark_cancelled)
+                for token_number in token_numbers
+            )
+    
     def update_patient_attributes(self, token_number: int, updates: Dict) -> bool:
         """
         Update patient attributes and recalculate priority.
@@ -373,42 +514,46 @@ class PriorityQueueManager:
         Returns:
             True if updated successfully
         """
-        if token_number not in self.patient_map:
-            print(f"[WARNING] Patient token #{token_number} not found in queue")
-            return False
-        
-        patient = self.patient_map[token_number]
-        
-        # Prepare MongoDB update
-        mongo_updates = {}
-        
-        # Update attributes
-        if "travel_eta_mins" in updates:
-            patient.travel_eta_mins = updates["travel_eta_mins"]
-            mongo_updates["travelEtaMins"] = updates["travel_eta_mins"]
-        if "actual_arrival" in updates:
-            patient.actual_arrival = updates["actual_arrival"]
-            mongo_updates["actualArrival"] = updates["actual_arrival"]
-        if "arrival_probability" in updates:
-            patient.arrival_probability = updates["arrival_probability"]
-            mongo_updates["arrivalProbability"] = updates["arrival_probability"]
-        
-        # Recalculate priority
-        old_score = patient.priority_score
-        patient.priority_score = self.calculate_priority_score(patient)
-        patient.last_priority_update = datetime.utcnow().isoformat()
-        
-        mongo_updates["priorityScore"] = patient.priority_score
-        mongo_updates["lastPriorityUpdate"] = datetime.utcnow()
+        # Scores change on nodes still in the heaps, so hold the lock until
+        # the heaps are rebuilt
+        with self._lock:
+            if token_number not in self.patient_map:
+                print(f"[WARNING] Patient token #{token_number} not found in queue")
+                return False
+            
+            patient = self.patient_map[token_number]
+            
+            # Prepare MongoDB update
+            mongo_updates = {}
+            
+            # Update attributes
+            if "travel_eta_mins" in updates:
+                patient.travel_eta_mins = updates["travel_eta_mins"]
+                mongo_updates["travelEtaMins"] = updates["travel_eta_mins"]
+            if "actual_arrival" in updates:
+                patient.actual_arrival = updates["actual_arrival"]
+                mongo_updates["actualArrival"] = updates["actual_arrival"]
+            if "arrival_probability" in updates:
+                patient.arrival_probability = updates["arrival_probability"]
+                mongo_updates["arrivalProbability"] = updates["arrival_probability"]
+            
+            # Recalculate priority
+            old_score = patient.priority_score
+            patient.priority_score = self.calculate_priority_score(patient)
+            patient.last_priority_update = datetime.utcnow().isoformat()
+            
+            mongo_updates["priorityScore"] = patient.priority_score
+            mongo_updates["lastPriorityUpdate"] = datetime.utcnow()
+            
+            # Reheapify (O(n) but necessary for correctness)
+            self._rebuild_heaps()
         
         # Update MongoDB
         self.patient_model.update_patient(token_number, mongo_updates)
+        self.queue_state.record_reorder()
         
         print(f"[CYCLE] [Update] Token #{token_number}: Priority {old_score} → {patient.priority_score}")
         
-        # Reheapify (O(n) but necessary for correctness)
-        self._reheapify_queue()
-        
         return True
     
     def apply_aging(self, elapsed_mins: float = 1.0):
@@ -419,59 +564,80 @@ class PriorityQueueManager:
         Args:
             elapsed_mins: Time elapsed since last aging cycle
         """
-        aging_boosts = 0
-        
-        for token, patient in self.patient_map.items():
-            # Increment waiting time
-            self.wait_tracker[token] += elapsed_mins
-            patient.waiting_time_mins = self.wait_tracker[token]
+        with self._lock:
+            self._version += 1
+            aging_boosts = 0
+            wait_tracker = self.wait_tracker
+            calculate_priority_score = self.calculate_priority_score
             
-            # Recalculate priority (aging reduces score = higher priority)
-            old_score = patient.priority_score
-            patient.priority_score = self.calculate_priority_score(patient)
-            
-            if patient.priority_score < old_score:
-                aging_boosts += 1
+            for token, patient in self.patient_map.items():
+                # Increment waiting time
+                wait_tracker[token] += elapsed_mins
+                patient.waiting_time_mins = wait_tracker[token]
                 
-                # Alert if approaching starvation
-                if patient.waiting_time_mins > self.starvation_threshold_mins:
-                    print(f"[WARNING] [Starvation Alert] Token #{token} waiting {patient.waiting_time_mins:.0f} mins")
+                # Recalculate priority (aging reduces score = higher priority)
+                old_score = patient.priority_score
+                patient.priority_score = calculate_priority_score(patient)
+                
+                if patient.priority_score < old_score:
+                    aging_boosts += 1
+                    
+                    # Alert if approaching starvation
+                    if patient.waiting_time_mins > self.starvation_threshold_mins:
+                        print(f"[WARNING] [Starvation Alert] Token #{token} waiting {patient.waiting_time_mins:.0f} mins")
+            
+            # Rebuild before releasing the lock so no push sees a stale heap
+            if aging_boosts > 0:
+                self._rebuild_heaps()
         
         if aging_boosts > 0:
             print(f"[CLOCK] [Aging] Boosted {aging_boosts} patients' priority")
-            self._reheapify_queue()
+            self.queue_state.record_reorder()
     
     def get_queue_snapshot(self) -> Dict:
         """
         Get current queue state without modifying it.
         
+        The snapshot is cached until the queue changes; each call returns a
+        copy, so callers may modify the result freely.
+        
         Returns:
             Dict with queue statistics and patient list
         """
+        # Copy under the lock so concurrent bookings can't mutate mid-iteration
+        with self._lock:
+            cached = self._snapshot_cache
+            if cached is not None and cached[0] == self._version:
+                return self._copy_snapshot(cached[1])
+            version = self._version
+            emergency_queue = list(self.emergency_queue)
+            main_queue = list(self.main_queue)
+            wait_tracker = dict(self.wait_tracker)
+        
         # Merge and sort all patients by priority
         all_patients = []
         
         # Emergency patients (convert negative scores back)
-        for p in self.emergency_queue:
+        for p in emergency_queue:
             patient_dict = {
                 "token_number": p.token_number,
                 "name": p.name,
                 "priority_score": -p.priority_score,  # Restore original
                 "emergency_level": "CRITICAL",
-                "waiting_time_mins": self.wait_tracker.get(p.token_number, 0),
+                "waiting_time_mins": wait_tracker.get(p.token_number, 0),
                 "travel_eta_mins": p.travel_eta_mins,
                 "symptoms": p.symptoms,
             }
             all_patients.append(patient_dict)
         
         # Main queue patients
-        for p in self.main_queue:
+        for p in main_queue:
             patient_dict = {
                 "token_number": p.token_number,
                 "name": p.name,
                 "priority_score": p.priority_score,
-                "emergency_level": ["NORMAL", "PRIORITY", "CRITICAL"][p.emergency_level],
-                "waiting_time_mins": self.wait_tracker.get(p.token_number, 0),
+                "emergency_level": EMERGENCY_LEVEL_NAMES[p.emergency_level],
+                "waiting_time_mins": wait_tracker.get(p.token_number, 0),
                 "travel_eta_mins": p.travel_eta_mins,
                 "symptoms": p.symptoms,
             }
@@ -488,7 +654,7 @@ class PriorityQueueManager:
         # Emergency patients always come first
         sorted_patients = emergency_patients + main_patients
         
-        return {
+        snapshot = {
             "total_patients": len(sorted_patients),
             "emergency_count": len(emergency_patients),
             "main_queue_count": len(main_patients),
@@ -499,61 +665,157 @@ class PriorityQueueManager:
                 "reorder_count": self.reorder_count,
             }
         }
+        # Tagged with the version it was built from, so a change made
+        # meanwhile still forces a rebuild next time
+        self._snapshot_cache = (version, snapshot)
+        
+        return self._copy_snapshot(snapshot)
     
-    def _reheapify_queue(self):
-        """Rebuild heap structure after priority updates"""
+    @staticmethod
+    def _copy_snapshot(snapshot: Dict) -> Dict:
+        """Copy a cached snapshot so callers can't modify the cache"""
+        return {
+            **snapshot,
+            "patients": [dict(p) for p in snapshot["patients"]],
+            "statistics": dict(snapshot["statistics"]),
+        }
+    
+    def get_queue_head(self, k: int = 10) -> Dict:
+        """
+        Get queue counts and only the first k patients.
+        Cheaper than get_queue_snapshot() when callers only show the top.
+        
+        Args:
+            k: Number of patients to include
+            
+        Returns:
+            Dict shaped like get_queue_snapshot(), with patients cut to k
+        """
+        with self._lock:
+            # (restored score, node) in snapshot order: emergency list first
+            entries = [(-p.priority_score, p) for p in self.emergency_queue]
+            entries.extend((p.priority_score, p) for p in self.main_queue)
+            
+            # Same order as get_queue_snapshot: PRIORITY/CRITICAL first, then by score
+            head = heapq.nsmallest(
+                k, entries, key=lambda e: (e[1].emergency_level == EmergencyLevel.NORMAL, e[0])
+            )
+            emergency_count = sum(
+                1 for _, p in entries if p.emergency_level != EmergencyLevel.NORMAL
+            )
+            
+            patients = [
+                {
+                    "token_number": p.token_number,
+                    "name": p.name,
+                    "priority_score": score,
+                    "emergency_level": EMERGENCY_LEVEL_NAMES[p.emergency_level],
+                    "waiting_time_mins": self.wait_tracker.get(p.token_number, 0),
+                    "travel_eta_mins": p.travel_eta_mins,
+                    "symptoms": p.symptoms,
+                }
+                for score, p in head
+            ]
+            
+            return {
+                "total_patients": len(entries),
+                "emergency_count": emergency_count,
+                "main_queue_count": len(entries) - emergency_count,
+                "patients": patients,
+                "statistics": {
+                    "total_enqueued": self.total_enqueued,
+                    "total_dequeued": self.total_dequeued,
+                    "reorder_count": self.reorder_count,
+                }
+            }
+    
+    def _rebuild_heaps(self):
+        """Restore the heap invariant; callers must hold self._lock"""
         heapq.heapify(self.main_queue)
         heapq.heapify(self.emergency_queue)
         self.reorder_count += 1
+        self._version += 1
+    
+    def sync_from_mongodb(self) -> int:
+        """
+        Apply patient changes written to MongoDB by other processes.
+        Patients that are no longer waiting are dropped and new waiting
+        patients are added; patients already queued keep their in-memory
+        scores and aging. Call it between requests, not during a booking.
         
-        # Record reorder in MongoDB
-        self.queue_state.record_reorder()
+        Returns:
+            Number of patients added or removed
+        """
+        # Re-read a little before the last sync so a writer whose clock is
+        # slightly behind isn't missed; applying a change twice is harmless
+        started = datetime.utcnow()
+        changed = self.patient_model.get_changed_since(self._synced_at - self.sync_overlap)
+        if changed is None:
+            return 0
+        
+        applied = 0
+        with self._lock:
+            for mongo_patient in changed:
+                token_number = mongo_patient.get("tokenNumber")
+                waiting = mongo_patient.get("status") == "WAITING" and mongo_patient.get("isActive", False)
+                if waiting and token_number not in self.patient_map:
+                    self._add_loaded_patient(self._node_from_document(mongo_patient))
+                    applied += 1
+                elif not waiting and token_number in self.patient_map:
+                    self.remove_patient(token_number, mark_cancelled=False)
+                    applied += 1
+            if applied:
+                self._version += 1
+        self._synced_at = started
+        
+        if applied:
+            print(f"[OK] Synced {applied} patient changes from MongoDB")
+        return applied
+    
+    def _node_from_document(self, mongo_patient: Dict) -> PatientNode:
+        """Convert a MongoDB patient document to a PatientNode"""
+        emergency_map = {"CRITICAL": EmergencyLevel.CRITICAL, "PRIORITY": EmergencyLevel.PRIORITY, "NORMAL": EmergencyLevel.NORMAL}
+        
+        return PatientNode(
+            priority_score=mongo_patient.get("priorityScore", 0),
+            token_number=mongo_patient["tokenNumber"],
+            name=mongo_patient["name"],
+            contact_number=mongo_patient["contactNumber"],
+            emergency_level=emergency_map.get(mongo_patient.get("emergencyLevel", "NORMAL"), EmergencyLevel.NORMAL),
+            travel_eta_mins=mongo_patient.get("travelEtaMins", 20),
+            predicted_consult_mins=mongo_patient.get("predictedConsultMins", 15),
+            waiting_time_mins=mongo_patient.get("waitingTimeMins", 0),
+            symptoms=mongo_patient.get("symptoms", ""),
+            symptoms_analysis=mongo_patient.get("symptomsAnalysis", {}),
+            location=mongo_patient.get("location", ""),
+            travel_data=mongo_patient.get("travelData", {}),
+            booking_time=str(mongo_patient.get("bookingTime", datetime.utcnow())),
+        )
+    
+    def _add_loaded_patient(self, patient: PatientNode):
+        """Queue a patient read from MongoDB; callers must hold self._lock"""
+        # Add to appropriate queue
+        if patient.emergency_level == EmergencyLevel.CRITICAL:
+            heapq.heappush(self.emergency_queue, self._emergency_node(patient))
+        else:
+            heapq.heappush(self.main_queue, patient)
+        
+        # Add to map
+        self.patient_map[patient.token_number] = patient
+        self.wait_tracker[patient.token_number] = patient.waiting_time_mins
     
     def _load_from_mongodb(self):
         """Load existing active patients from MongoDB on startup"""
         try:
             # Get all active waiting patients from MongoDB
+            started = datetime.utcnow()
             patients = self.patient_model.get_active_queue()
             
-            for mongo_patient in patients:
-                # Convert to PatientNode
-                emergency_map = {"CRITICAL": EmergencyLevel.CRITICAL, "PRIORITY": EmergencyLevel.PRIORITY, "NORMAL": EmergencyLevel.NORMAL}
-                
-                patient = PatientNode(
-                    priority_score=mongo_patient.get("priorityScore", 0),
-                    token_number=mongo_patient["tokenNumber"],
-                    name=mongo_patient["name"],
-                    contact_number=mongo_patient["contactNumber"],
-                    emergency_level=emergency_map.get(mongo_patient.get("emergencyLevel", "NORMAL"), EmergencyLevel.NORMAL),
-                    travel_eta_mins=mongo_patient.get("travelEtaMins", 20),
-                    predicted_consult_mins=mongo_patient.get("predictedConsultMins", 15),
-                    waiting_time_mins=mongo_patient.get("waitingTimeMins", 0),
-                    symptoms=mongo_patient.get("symptoms", ""),
-                    symptoms_analysis=mongo_patient.get("symptomsAnalysis", {}),
-                    location=mongo_patient.get("location", ""),
-                    travel_data=mongo_patient.get("travelData", {}),
-                    booking_time=str(mongo_patient.get("bookingTime", datetime.utcnow())),
-                )
-                
-                # Add to appropriate queue
-                if patient.emergency_level == EmergencyLevel.CRITICAL:
-                    heapq.heappush(self.emergency_queue, PatientNode(
-                        priority_score=-patient.priority_score,
-                        token_number=patient.token_number,
-                        name=patient.name,
-                        contact_number=patient.contact_number,
-                        emergency_level=patient.emergency_level,
-                        travel_eta_mins=patient.travel_eta_mins,
-                        predicted_consult_mins=patient.predicted_consult_mins,
-                        symptoms=patient.symptoms,
-                        symptoms_analysis=patient.symptoms_analysis,
-                    ))
-                else:
-                    heapq.heappush(self.main_queue, patient)
-                
-                # Add to map
-                self.patient_map[patient.token_number] = patient
-                self.wait_tracker[patient.token_number] = patient.waiting_time_mins
+            with self._lock:
+                for mongo_patient in patients:
+                    self._add_loaded_patient(self._node_from_document(mongo_patient))
+                self._version += 1
+            self._synced_at = started
             
             if patients:
                 print(f"[OK] Loaded {len(patients)} patients from MongoDB")
@@ -9,18 +9,14 @@ from tools.priority_queue_manager import get_priority_queue_manager
 from tools.queue_reorder_tools import (
     analyze_queue_for_optimization,
     execute_intelligent_queue_reorder,
+    get_redis_queue_status,
 )
 from tools.starvation_tracker import get_starvation_status, get_protected_patients
+from tools.redis_client import get_redis
 
 # Redis connection
 try:
-    redis_client = redis.Redis(
-        host=os.getenv("REDIS_HOST", "localhost"),
-        port=int(os.getenv("REDIS_PORT", 6379)),
-        password=os.getenv("REDIS_PASSWORD", None),
-        db=0,
-        decode_responses=True,
-    )
+    redis_client = get_redis()
     redis_client.ping()
     print("[OK] Queue Brain: Successfully connected to Redis.")
     
@@ -68,6 +64,42 @@ def start_aging_cycle():
 if pq_manager:
     start_aging_cycle()
 
+# Debounced optimization: bookings set QUEUE_DIRTY_KEY, one thread optimizes per burst
+QUEUE_DIRTY_KEY = "queue_dirty"
+OPTIMIZE_DEBOUNCE_SECS = 0.05
+_optimize_thread_started = False
+
+def start_optimize_debounce():
+    """
+    Run analyze_and_optimize_queue once per burst of bookings instead of per booking.
+    
+    Only the long-lived server calls this at startup; importing this module
+    does not start the thread, so short-lived scripts never consume the flag.
+    """
+    global _optimize_thread_started
+    
+    if _optimize_thread_started or not redis_client or not pq_manager:
+        return
+    
+    def optimize_loop():
+        print("[CLOCK] [Queue Brain] Optimize debounce started (polls every 50ms)")
+        while True:
+            try:
+                time.sleep(OPTIMIZE_DEBOUNCE_SECS)
+                
+                # GETDEL clears the flag atomically, so a burst collapses into one run
+                if redis_client.getdel(QUEUE_DIRTY_KEY):
+                    analyze_and_optimize_queue()
+                
+            except Exception as e:
+                print(f"[ERROR] [Queue Brain] Optimize debounce error: {e}")
+                time.sleep(1)
+    
+    optimize_thread = threading.Thread(target=optimize_loop, daemon=True, name="OptimizeDebounceThread")
+    optimize_thread.start()
+    _optimize_thread_started = True
+    print("[OK] [Queue Brain] Optimize debounce background thread started")
+
 
 def analyze_and_optimize_queue() -> str:
     """
@@ -84,8 +116,8 @@ def analyze_and_optimize_queue() -> str:
     print("[BRAIN] [Queue Brain] Starting comprehensive queue analysis and optimization...")
 
     try:
-        # Get current queue snapshot from priority queue
-        snapshot = pq_manager.get_queue_snapshot()
+        # Counts plus the top 10 patients; the report never lists more
+        snapshot = pq_manager.get_queue_head(10)
         
         # Priority queue automatically maintains optimal order
         # But we can still analyze and report on the state
@@ -95,6 +127,9 @@ def analyze_and_optimize_queue() -> str:
         main_queue_count = snapshot['main_queue_count']
         stats = snapshot['statistics']
         
+        # Redis booking queue is a ZSET kept in urgency order on insert
+        redis_status = get_redis_queue_status(redis_client)
+        
         # Generate comprehensive report
         ist_time = (datetime.utcnow() + timedelta(hours=5, minutes=30)).strftime('%Y-%m-%d %H:%M:%S IST')
         
@@ -107,6 +142,7 @@ Analysis Time: {ist_time}
 ├─ Total Patients: {total_patients}
 ├─ Emergency Queue (Max-Heap): {emergency_count} patients
 ├─ Main Queue (Min-Heap): {main_queue_count} patients
+├─ Redis Queue: {_format_redis_queue_status(redis_status)}
 └─ System Status: [OK] Automatic Optimization Active
 
 [FAST] PRIORITY QUEUE STATISTICS:
@@ -119,7 +155,7 @@ Analysis Time: {ist_time}
 """
         
         # Show top 10 patients
-        for i, patient in enumerate(snapshot['patients'][:10], 1):
+        for i, patient in enumerate(snapshot['patients'], 1):
             emergency_marker = "🚨" if patient['emergency_level'] in ['PRIORITY', 'CRITICAL'] else "📋"
             report += f"""
 {emergency_marker} Position #{i}: Token #{patient['token_number']} - {patient['name']}
@@ -324,6 +360,13 @@ Token: #{patient_token}
 
 
 # Helper functions
+def _format_redis_queue_status(redis_status: Dict) -> str:
+    """Describe the Redis booking queue for reports"""
+    if not redis_status.get("success"):
+        return f"Unavailable ({redis_status.get('error', 'unknown error')})"
+    return f"{redis_status['total_patients']} patients in urgency order"
+
+
 def _generate_queue_brain_report(
     analysis_result: Dict, optimization_result: Dict
 ) -> str:
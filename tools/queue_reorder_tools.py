@@ -408,12 +408,27 @@ class QueueReorderManager:
             Update result
         """
         try:
-            # Clear current queue
-            self.redis_client.delete("patient_queue")
+            # patient_queue is a ZSET, so order is expressed through scores.
+            # Reuse the current scores in ascending order so new bookings still
+            # interleave by urgency; extra patients go after the last slot.
+            scores = [
+                score for _, score in
+                self.redis_client.zrange("patient_queue", 0, -1, withscores=True)
+            ]
+            next_score = scores[-1] + 1 if scores else 0
+            while len(scores) < len(new_queue_order):
+                scores.append(next_score)
+                next_score += 1
             
-            # Add patients in new order
-            for patient in new_queue_order:
-                self.redis_client.rpush("patient_queue", json.dumps(patient))
+            # Replace the queue in one transaction
+            pipe = self.redis_client.pipeline(transaction=True)
+            pipe.delete("patient_queue")
+            if new_queue_order:
+                pipe.zadd("patient_queue", {
+                    json.dumps(patient): score
+                    for patient, score in zip(new_queue_order, scores)
+                })
+            pipe.execute()
             
             print(f"[OK] [Queue Brain] Updated queue order with {len(new_queue_order)} patients")
             
@@ -483,6 +498,31 @@ def execute_intelligent_queue_reorder(redis_client) -> Dict:
             "analysis": analysis
         }
 
+def get_redis_queue_status(redis_client, queue_key: str = "patient_queue") -> Dict:
+    """
+    Report the size of the Redis patient queue.
+    
+    The queue is a ZSET scored by urgency then booking time (see
+    clinic_tools.patient_queue_score), so it is kept in urgency order on
+    insert and never needs reordering.
+    
+    Args:
+        redis_client: Redis connection
+        queue_key: Redis sorted set holding patient JSON
+        
+    Returns:
+        Status with the total patient count
+    """
+    if not redis_client:
+        return {"success": False, "error": "Redis not available"}
+    
+    try:
+        total = redis_client.zcard(queue_key)
+        return {"success": True, "total_patients": total}
+    except Exception as e:
+        print(f"[ERROR] [Queue Brain] Error reading Redis queue status: {e}")
+        return {"success": False, "error": str(e)}
+
 def update_queue_order_manually(new_patient_order: List[Dict], redis_client) -> Dict:
     """
     Manually update queue order.
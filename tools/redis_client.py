@@ -0,0 +1,38 @@
+"""
+Shared Redis connection pool for the clinic tools.
+Every tools module and test script draws connections from one pool
+instead of opening its own, so TCP connections are kept alive and reused.
+"""
+
+import os
+import socket
+import redis
+
+# Global pool, created on first use so env files are loaded first
+_pool = None
+
+
+def _keepalive_options() -> dict:
+    """TCP keepalive tuning where the platform exposes it"""
+    options = {}
+    for name, value in (("TCP_KEEPIDLE", 60), ("TCP_KEEPINTVL", 10), ("TCP_KEEPCNT", 3)):
+        if hasattr(socket, name):
+            options[getattr(socket, name)] = value
+    return options
+
+
+def get_redis() -> redis.Redis:
+    """Get a Redis client backed by the shared connection pool"""
+    global _pool
+    if _pool is None:
+        _pool = redis.ConnectionPool(
+            host=os.getenv("REDIS_HOST", "localhost"),
+            port=int(os.getenv("REDIS_PORT", 6379)),
+            password=os.getenv("REDIS_PASSWORD", None),
+            db=0,
+            decode_responses=True,
+            max_connections=int(os.getenv("REDIS_MAX_CONNECTIONS", 32)),
+            socket_keepalive=True,
+            socket_keepalive_options=_keepalive_options(),
+        )
+    return redis.Redis(connection_pool=_pool)
@@ -3,7 +3,6 @@ Final System Verification Script
 Tests all migrated components and confirms no legacy dependencies
 """
 
-import redis
 import json
 from datetime import datetime
 
@@ -31,9 +30,11 @@ def print_info(text):
 def verify_no_legacy_redis():
     """Verify no data in old Redis lists"""
     try:
-        redis_client = redis.Redis(decode_responses=True)
+        from tools.redis_client import get_redis
         
-        patient_queue_len = redis_client.llen("patient_queue")
+        redis_client = get_redis()
+        
+        patient_queue_len = redis_client.zcard("patient_queue")
         emergency_queue_len = redis_client.llen("emergency_queue")
         
         if patient_queue_len == 0 and emergency_queue_len == 0:
@@ -50,9 +51,9 @@ def verify_priority_queue_manager():
     """Verify priority queue manager is working"""
     try:
         from tools.priority_queue_manager import get_priority_queue_manager
-        import redis
+        from tools.redis_client import get_redis
         
-        redis_client = redis.Redis(decode_responses=True)
+        redis_client = get_redis()
         pq_manager = get_priority_queue_manager(redis_client)
         
         # Test basic operations
@@ -6,19 +6,16 @@ This test confirms the agentic workflow is truly multi-agent, not simulated.
 import os
 import sys
 import json
-import redis
 from datetime import datetime
 from dotenv import load_dotenv
 
 # Load environment
 load_dotenv("tools/.env")
 
+from tools.redis_client import get_redis
+
 # Setup Redis
-redis_client = redis.Redis(
-    host=os.getenv("REDIS_HOST", "localhost"),
-    port=int(os.getenv("REDIS_PORT", 6379)),
-    decode_responses=True,
-)
+redis_client = get_redis()
 
 print("\n" + "=" * 70)
 print("🔍 TOOL EXECUTION VERIFICATION TEST")
@@ -31,7 +28,7 @@ print("-" * 50)
 from tools.clinic_tools import book_intelligent_patient_appointment
 
 # Get initial queue size
-initial_queue_size = redis_client.llen("patient_queue")
+initial_queue_size = redis_client.zcard("patient_queue")
 print(f"Initial Queue Size: {initial_queue_size}")
 
 # Call tool directly
@@ -44,7 +41,7 @@ result = book_intelligent_patient_appointment(
 )
 
 # Check if Redis was modified
-final_queue_size = redis_client.llen("patient_queue")
+final_queue_size = redis_client.zcard("patient_queue")
 print(f"\nFinal Queue Size: {final_queue_size}")
 
 if final_queue_size > initial_queue_size:
@@ -52,8 +49,11 @@ if final_queue_size > initial_queue_size:
     print(f"   Added {final_queue_size - initial_queue_size} patient(s) to queue")
     
     # Show the new patient
-    latest_patient_json = redis_client.lindex("patient_queue", -1)
-    latest_patient = json.loads(latest_patient_json)
+    # Queue is ordered by urgency, so the latest booking has the highest token
+    latest_patient = max(
+        map(json.loads, redis_client.zrange("patient_queue", 0, -1)),
+        key=lambda p: p["token_number"],
+    )
     print(f"   Latest patient: {latest_patient['name']} (Token #{latest_patient['token_number']})")
 else:
     print("❌ FAIL: Tool did NOT modify Redis - text generation only?")
@@ -120,7 +120,7 @@ print("-" * 50)
 
 from tools.eta_tools import calculate_intelligent_etas
 
-if redis_client.llen("patient_queue") > 0:
+if redis_client.zcard("patient_queue") > 0:
     eta_result = calculate_intelligent_etas()
     
     if "IST" in eta_result:
@@ -162,7 +162,7 @@ print("📋 SUMMARY")
 print("=" * 70)
 print(f"""
 Current Queue Status:
-- Total Patients: {redis_client.llen('patient_queue')}
+- Total Patients: {redis_client.zcard('patient_queue')}
 - Emergency Patients: {redis_client.llen('emergency_queue')}
 
 Key Findings: